@@ -0,0 +1,96 @@
+import mmap
+import os
+import random
+import struct
+from dataclasses import dataclass
+
+from nChess.nBoard import nBoard, Move
+from nChess.nBoard.Symmetry import canonical_key
+from nChess.Book import MAGIC, HEADER, RECORDS
+
+
+@dataclass(frozen=True, slots=True)
+class BookEntry:
+    move: Move
+    weight: int
+    count: int
+
+
+class Book:
+    """Read side of an opening book written by BookBuilder.
+
+    Probes canonicalize the position, binary search the memory-mapped records
+    for its key and map the stored moves back onto the board. Moves that are
+    not legal there, which only a key collision can produce, are dropped.
+    """
+
+    path: str
+    record: struct.Struct
+    records: int
+
+    def __init__(self, path: str, generator: random.Random = None):
+        self.path = path
+        self.generator = generator if generator is not None else random.Random()
+
+        with open(path, "rb") as file:
+            header = file.read(HEADER)
+            assert header[:-1] == MAGIC and header[-1] in RECORDS, f"{path} is not an opening book"
+            size = os.fstat(file.fileno()).st_size
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size > HEADER else None
+        self.record = RECORDS[header[-1]]
+        self.records = (size - HEADER) // self.record.size
+
+    def __enter__(self) -> "Book":
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def __len__(self) -> int:
+        return self.records
+
+    def lower_bound(self, key: int) -> int:
+        low, high = 0, self.records
+        while low < high:
+            middle = (low + high) // 2
+            if self.record.unpack_from(self.map, HEADER + middle * self.record.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entries(self, board: nBoard) -> list[BookEntry]:
+        if self.map is None:
+            return []
+
+        key, transform = canonical_key(board)
+        inverse = transform.inverse()
+        tables = board.tables
+        color = board.current_turn()
+
+        entries = []
+        for record in range(self.lower_bound(key), self.records):
+            entry_key, packed_move, weight, count = self.record.unpack_from(self.map, HEADER + record * self.record.size)
+            if entry_key != key:
+                break
+            move = inverse.move(tables.unpack(packed_move), board.size)
+            if (
+                board.contains(move.initial_position)
+                and board.get(move.initial_position).color == color
+                and move in board.legal_moves_from(move.initial_position)
+            ):
+                entries.append(BookEntry(move, weight, count))
+        return entries
+
+    def choose(self, board: nBoard) -> Move:
+        """A book move of board drawn with probability proportional to its
+        weight, or None if the position is not in the book."""
+        entries = self.entries(board)
+        if not entries:
+            return None
+        return self.generator.choices([entry.move for entry in entries], [entry.weight for entry in entries])[0]
@@ -0,0 +1,80 @@
+import os
+from typing import Iterable
+
+from nChess.nBoard import nBoard, Move
+from nChess.nBoard.Encoding import color_type
+from nChess.nBoard.Symmetry import canonical_key
+from nChess.Book import MAGIC, VERSION, RECORD
+from nChess.Database.GameStore import GameStore
+from nChess.Engine.Engine import Engine
+
+
+class BookBuilder:
+    """Collects weighted (position, move) pairs from games and searches and
+    writes them as a book file. Positions are stored in canonical form, so
+    symmetric positions share their entries."""
+
+    # [weight, count] by (canonical key, packed canonical move).
+    entries: dict[tuple[int, int], list[int]]
+
+    def __init__(self):
+        self.entries = {}
+
+    def add(self, board: nBoard, move: Move, weight: int = 1):
+        key, transform = canonical_key(board)
+        packed_move = board.tables.pack(transform.move(move, board.size))
+        entry = self.entries.setdefault((key, packed_move), [0, 0])
+        entry[0] += weight
+        entry[1] += 1
+
+    def add_game(self, board: nBoard, moves: Iterable[Move], plies: int = None, weight: int = 1):
+        """Adds the first plies moves of the game played from board (left untouched)."""
+        replay = nBoard.from_bytes(board.to_bytes(), color_type(board))
+        for ply, move in enumerate(moves):
+            if plies is not None and ply >= plies:
+                break
+            self.add(replay, move, weight)
+            replay.make_move(move)
+
+    def add_store(self, store: GameStore, plies: int = None):
+        for game in store.games():
+            self.add_game(store.position(game, 0), store.moves(game), plies)
+
+    def add_search(
+        self,
+        board: nBoard,
+        engine: Engine,
+        plies: int,
+        depth: int = None,
+        time_limit: float = None,
+        weight: int = 1
+    ):
+        """Searches every position reachable from board in fewer than plies plies,
+        symmetric ones once, and adds the best move found in each."""
+        seen = set()
+
+        def visit(remaining: int):
+            key, _ = canonical_key(board)
+            if remaining == 0 or key in seen:
+                return
+            seen.add(key)
+
+            best_move, _, _ = engine.search(board, depth, time_limit)
+            if best_move is None:
+                return
+            self.add(board, best_move, weight)
+
+            for move in board.legal_moves(board.current_turn()):
+                record = board.make_move(move)
+                visit(remaining - 1)
+                board.unmake_move(record)
+
+        visit(plies)
+
+    def write(self, path: str):
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(MAGIC + bytes([VERSION]))
+            for (key, packed_move), (weight, count) in sorted(self.entries.items()):
+                file.write(RECORD.pack(key, packed_move, weight, count))
+        os.replace(temporary, path)
@@ -0,0 +1,13 @@
+import struct
+
+# A book file is MAGIC and VERSION followed by RECORD entries sorted by key,
+# then by move: the canonical_key of a position, a move of its canonical form
+# packed with AttackTables.pack, the summed weight and the number of times the
+# move was added. Packed moves take 64 bits, since from_index * cells +
+# to_index overflows 32 bits on boards of more than 65536 cells; version 1
+# books, which stored them in 32, are still read.
+MAGIC = b"nCBK"
+VERSION = 2
+HEADER = len(MAGIC) + 1
+RECORD = struct.Struct("<QQII")
+RECORDS = {1: struct.Struct("<QIII"), VERSION: RECORD}
@@ -0,0 +1,52 @@
+import sys
+from argparse import ArgumentParser
+
+from nChess.bench import position
+from nChess.Piece import move_name
+from nChess.Book.Book import Book
+from nChess.Book.BookBuilder import BookBuilder
+from nChess.Database.GameStore import GameStore
+from nChess.Engine.Engine import Engine
+from nChess.Engine.TranspositionTable import TranspositionTable
+
+
+def main():
+    parser = ArgumentParser(prog="python -m nChess.Book", description="Builds and probes opening books.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="write a book from searches of start positions and from stored games")
+    build.add_argument("book")
+    build.add_argument(
+        "positions", nargs="*", default=[],
+        help="classic, tesseract or hypercube:<dimension>:<side> start positions to search"
+    )
+    build.add_argument("-p", "--plies", type=int, default=2, help="plies searched from each start position")
+    build.add_argument("-d", "--depth", type=int, help="search depth (default: the engine's)")
+    build.add_argument("-t", "--time", type=float, help="time limit per searched position")
+    build.add_argument("--games", help="game store to add games from")
+    build.add_argument("--game-plies", type=int, default=16, help="plies added from each stored game")
+
+    probe = commands.add_parser("probe", help="list the book moves of a start position")
+    probe.add_argument("book")
+    probe.add_argument("position", nargs="?", default="classic")
+
+    arguments = parser.parse_args()
+
+    if arguments.command == "build":
+        builder = BookBuilder()
+        engine = Engine(transposition_table=TranspositionTable())
+        for name in arguments.positions:
+            builder.add_search(position(name), engine, arguments.plies, arguments.depth, arguments.time)
+        if arguments.games:
+            with GameStore(arguments.games) as store:
+                builder.add_store(store, arguments.game_plies)
+        builder.write(arguments.book)
+        print(f"{len(builder.entries)} entries", file=sys.stderr)
+    else:
+        with Book(arguments.book) as book:
+            for entry in book.entries(position(arguments.position)):
+                print(f"{move_name(entry.move)} weight {entry.weight} count {entry.count}")
+
+
+if __name__ == "__main__":
+    main()
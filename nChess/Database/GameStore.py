@@ -0,0 +1,241 @@
+import mmap
+import os
+import struct
+from array import array
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, Iterator, TextIO, Type
+
+from nChess.nBoard import nBoard, Move, IntegerVector
+from nChess.nBoard.AttackTables import attack_tables
+from nChess.nBoard.Encoding import read_header, same_position
+from nChess.Database import material_signature, material_key
+from nChess.Database.Index import Index
+from nChess.Piece import move_name
+
+MAGIC = b"nCDB"
+VERSION = 1
+SNAPSHOT_INTERVAL = 32
+
+# Record length, then the initial position, the moves and the snapshots.
+LENGTH = struct.Struct("<I")
+POSITION = struct.Struct("<H")
+MOVES = struct.Struct("<I")
+SNAPSHOTS = struct.Struct("<H")
+SNAPSHOT = struct.Struct("<IH")
+
+
+@dataclass(frozen=True)
+class GameRecord:
+    offset: int
+    position: bytes
+    moves: array
+    # Ply and encoded position of every snapshot, in ply order.
+    snapshots: tuple[tuple[int, bytes], ...]
+
+
+class GameStore:
+    """Append-only store of games in a flat file, read back through mmap.
+
+    Each game keeps its initial position, its moves packed as pairs of flat
+    indices and a snapshot of the position every SNAPSHOT_INTERVAL plies. An
+    index maps the Zobrist key and the material_key of every position of every
+    game to the game and ply it occurs at. Games are identified by the offset
+    of their record.
+    """
+
+    path: str
+    colors: Type[Enum]
+    index: Index
+
+    def __init__(self, path: str, colors: Type[Enum] = None):
+        self.path = path
+        self.colors = colors
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as file:
+                file.write(MAGIC + bytes([VERSION]))
+        with open(path, "rb") as file:
+            assert file.read(len(MAGIC) + 1) == MAGIC + bytes([VERSION]), f"{path} is not a game store"
+
+        self.file = open(path, "ab")
+        self.index = Index(path + ".index")
+        self.map = None
+
+    def __enter__(self) -> "GameStore":
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+        self.index.close()
+
+    def add(self, board: nBoard, moves: Iterable[Move]) -> int:
+        """Appends the game played from board (left untouched) and returns its id."""
+        position = board.to_bytes()
+        replay = nBoard.from_bytes(position, self.colors)
+        replay.track_codes()
+        offset = self.file.tell()
+
+        packed = array("I")
+        snapshots = []
+        entries = self.entries(replay, offset, 0)
+        for ply, move in enumerate(moves, 1):
+            packed.append(replay.flat_index(move.initial_position))
+            packed.append(replay.flat_index(move.final_position))
+            replay.make_move(move)
+            entries.extend(self.entries(replay, offset, ply))
+            if ply % SNAPSHOT_INTERVAL == 0:
+                snapshots.append((ply, replay.to_bytes()))
+
+        body = [POSITION.pack(len(position)), position, MOVES.pack(len(packed) // 2), packed.tobytes()]
+        body.append(SNAPSHOTS.pack(len(snapshots)))
+        for ply, snapshot in snapshots:
+            body.append(SNAPSHOT.pack(ply, len(snapshot)))
+            body.append(snapshot)
+        body = b"".join(body)
+
+        self.file.write(LENGTH.pack(len(body)) + body)
+        self.index.add(entries)
+        return offset
+
+    @staticmethod
+    def entries(board: nBoard, game: int, ply: int) -> list[tuple[int, int, int]]:
+        return [
+            (board.hash_key, game, ply),
+            (material_key(material_signature(board), board.size), game, ply)
+        ]
+
+    def add_games(self, games: Iterable[tuple[nBoard, Iterable[Move]]]) -> list[int]:
+        """Adds the games and returns their ids."""
+        return [self.add(board, moves) for board, moves in games]
+
+    def compact(self):
+        """Merges the index into a single sorted file, for the fastest lookups."""
+        self.index.compact()
+
+    def mapped(self) -> mmap.mmap:
+        """The data file mapped read-only, mapped again whenever it has grown.
+
+        Earlier maps are left to the iterators still reading them.
+        """
+        self.file.flush()
+        size = os.path.getsize(self.path)
+        if self.map is None or len(self.map) != size:
+            with open(self.path, "rb") as file:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.map
+
+    def games(self) -> Iterator[int]:
+        """Ids of every game, in insertion order."""
+        buffer = self.mapped()
+        offset = len(MAGIC) + 1
+        while offset < len(buffer):
+            yield offset
+            offset += LENGTH.size + LENGTH.unpack_from(buffer, offset)[0]
+
+    def record(self, game: int) -> GameRecord:
+        buffer = self.mapped()
+        offset = game + LENGTH.size
+
+        length, = POSITION.unpack_from(buffer, offset)
+        offset += POSITION.size
+        position = buffer[offset:offset + length]
+        offset += length
+
+        count, = MOVES.unpack_from(buffer, offset)
+        offset += MOVES.size
+        moves = array("I")
+        moves.frombytes(buffer[offset:offset + 2 * count * moves.itemsize])
+        offset += 2 * count * moves.itemsize
+
+        snapshots = []
+        count, = SNAPSHOTS.unpack_from(buffer, offset)
+        offset += SNAPSHOTS.size
+        for _ in range(count):
+            ply, length = SNAPSHOT.unpack_from(buffer, offset)
+            offset += SNAPSHOT.size
+            snapshots.append((ply, buffer[offset:offset + length]))
+            offset += length
+
+        return GameRecord(game, position, moves, tuple(snapshots))
+
+    def moves(self, game: int) -> Iterator[Move]:
+        record = self.record(game)
+        header = read_header(record.position)
+        positions = attack_tables(header.dimension, header.size).positions
+        packed = record.moves
+        for i in range(0, len(packed), 2):
+            yield Move(positions[packed[i]], positions[packed[i + 1]])
+
+    def position(self, game: int, ply: int) -> nBoard:
+        """The position of game after ply plies, replayed from the closest snapshot."""
+        record = self.record(game)
+        start, position = 0, record.position
+        for snapshot_ply, snapshot in record.snapshots:
+            if snapshot_ply > ply:
+                break
+            start, position = snapshot_ply, snapshot
+
+        board = nBoard.from_bytes(position, self.colors)
+        positions = board.tables.positions
+        packed = record.moves
+        assert ply <= len(packed) // 2
+        for i in range(2 * start, 2 * ply, 2):
+            board.make_move(Move(positions[packed[i]], positions[packed[i + 1]]))
+        return board
+
+    def positions(self, game: int) -> Iterator[nBoard]:
+        """Every position of game, from the initial one on, on a single board
+        that is moved forward between iterations."""
+        record = self.record(game)
+        board = nBoard.from_bytes(record.position, self.colors)
+        positions = board.tables.positions
+        packed = record.moves
+        yield board
+        for i in range(0, len(packed), 2):
+            board.make_move(Move(positions[packed[i]], positions[packed[i + 1]]))
+            yield board
+
+    def occurrences(self, key: int) -> Iterator[tuple[int, int]]:
+        return self.index.lookup(key)
+
+    def games_reaching(self, board: nBoard) -> Iterator[int]:
+        """Ids of the games that reach the position of board."""
+        seen = set()
+        for game, ply in self.occurrences(board.hash_key):
+            if game not in seen and same_position(self.position(game, ply), board):
+                seen.add(game)
+                yield game
+
+    def by_material(self, signature: str, size: IntegerVector) -> Iterator[nBoard]:
+        """Positions on boards of the given size whose material_signature is signature."""
+        key = material_key(signature, size)
+        for game, ply in self.occurrences(key):
+            board = self.position(game, ply)
+            if material_signature(board) == signature:
+                yield board
+
+    def export_text(self, file: TextIO):
+        """Writes one game per line: its initial position in nFEN, then its moves."""
+        for game in self.games():
+            board = nBoard.from_bytes(self.record(game).position, self.colors)
+            file.write(" ".join([board.to_nfen().replace(" ", ";"), *map(move_name, self.moves(game))]) + "\n")
+
+    def import_text(self, file: TextIO) -> list[int]:
+        """Adds the games of a file written by export_text."""
+        def games():
+            for line in file:
+                if not line.strip():
+                    continue
+                nfen, *moves = line.split()
+                yield nBoard.from_nfen(nfen.replace(";", " "), self.colors), [
+                    Move(*(tuple(map(int, square.split(","))) for square in move.split("-")))
+                    for move in moves
+                ]
+        return self.add_games(games())
@@ -0,0 +1,152 @@
+import heapq
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator
+
+# key, game offset, ply
+ENTRY = struct.Struct("<QQI")
+
+
+def read_entries(buffer, start: int = 0, stop: int = None) -> Iterator[tuple[int, int, int]]:
+    stop = len(buffer) if stop is None else stop
+    for offset in range(start, stop, ENTRY.size):
+        yield ENTRY.unpack_from(buffer, offset)
+
+
+class Index:
+    """On-disk multimap from 64-bit keys to (game offset, ply).
+
+    New entries are appended to a journal file. A full journal is sorted into
+    a run at level 0; a run landing on a level that already holds one is merged
+    with it into the next level, so every entry is rewritten about log2(entries
+    / journal_limit) times. compact() merges the journal and every run into the
+    index file on demand. Lookups binary search the index file and the runs
+    through mmap and scan the journal.
+    """
+
+    path: str
+    journal_path: str
+    journal_limit: int
+
+    def __init__(self, path: str, journal_limit: int = 1 << 16):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.journal_limit = journal_limit
+
+        for file_path in (self.path, self.journal_path):
+            open(file_path, "ab").close()
+        self.journal = open(self.journal_path, "ab")
+        self.journal_entries = os.path.getsize(self.journal_path) // ENTRY.size
+
+    def close(self):
+        self.journal.close()
+
+    def add(self, entries: Iterable[tuple[int, int, int]]):
+        for entry in entries:
+            self.journal.write(ENTRY.pack(*entry))
+            self.journal_entries += 1
+        if self.journal_entries >= self.journal_limit:
+            self.seal()
+
+    def flush(self):
+        self.journal.flush()
+
+    def run_path(self, level: int) -> str:
+        return f"{self.path}.{level}"
+
+    def levels(self) -> list[int]:
+        """Levels holding a run, lowest first."""
+        prefix = os.path.basename(self.path) + "."
+        return sorted(
+            int(name[len(prefix):])
+            for name in os.listdir(os.path.dirname(self.path) or ".")
+            if name.startswith(prefix) and name[len(prefix):].isdigit()
+        )
+
+    def mapped(self, path: str) -> mmap.mmap:
+        """A read-only map of path, or None if it is empty."""
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def lower_bound(self, buffer, key: int) -> int:
+        low, high = 0, len(buffer) // ENTRY.size
+        while low < high:
+            middle = (low + high) // 2
+            if ENTRY.unpack_from(buffer, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low * ENTRY.size
+
+    def lookup(self, key: int) -> Iterator[tuple[int, int]]:
+        """(game offset, ply) of every entry of key."""
+        self.flush()
+
+        for path in [self.path] + [self.run_path(level) for level in self.levels()]:
+            run = self.mapped(path)
+            if run is None:
+                continue
+            with run:
+                offset = self.lower_bound(run, key)
+                while offset < len(run):
+                    entry_key, game, ply = ENTRY.unpack_from(run, offset)
+                    if entry_key != key:
+                        break
+                    yield game, ply
+                    offset += ENTRY.size
+
+        journal = self.mapped(self.journal_path)
+        if journal is not None:
+            with journal:
+                for entry_key, game, ply in ENTRY.iter_unpack(journal):
+                    if entry_key == key:
+                        yield game, ply
+
+    def journal_run(self) -> list[tuple[int, int, int]]:
+        """The sorted entries of the journal."""
+        self.flush()
+        journal = self.mapped(self.journal_path)
+        if journal is None:
+            return []
+        with journal:
+            return sorted(ENTRY.iter_unpack(journal))
+
+    def write_run(self, path: str, paths: list[str], pending: list[tuple[int, int, int]]):
+        """Writes the merge of pending and the runs at paths to path, then
+        removes the runs and empties the journal."""
+        runs = [run for run in map(self.mapped, paths) if run is not None]
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as file:
+            for entry in heapq.merge(pending, *map(read_entries, runs)):
+                file.write(ENTRY.pack(*entry))
+        for run in runs:
+            run.close()
+
+        os.replace(temporary, path)
+        for run_path in paths:
+            if run_path != path:
+                os.remove(run_path)
+        self.journal.truncate(0)
+        self.journal_entries = 0
+
+    def seal(self):
+        """Sorts the journal into a run, merging it up the levels."""
+        pending = self.journal_run()
+        if not pending:
+            return
+        levels = set(self.levels())
+        level = 0
+        while level in levels:
+            level += 1
+        self.write_run(self.run_path(level), [self.run_path(below) for below in range(level)], pending)
+
+    def compact(self):
+        """Merges the journal and every run into the index file."""
+        pending = self.journal_run()
+        paths = [self.run_path(level) for level in self.levels()]
+        if not pending and not paths:
+            return
+        self.write_run(self.path, [self.path] + paths, pending)
@@ -0,0 +1,26 @@
+from nChess.nBoard import nBoard, IntegerVector
+from nChess.nBoard.Encoding import PIECE_TYPES, LETTERS, color_table
+from nChess.nBoard.Zobrist import zobrist_key
+
+
+def material_signature(board: nBoard) -> str:
+    """Piece counts per color of the color table, e.g. "KQR2B2N2P8/kqr2b2n2p8"
+    for the classic start position; upper case for the first color."""
+    counts = {}
+    for piece in board.pieces:
+        key = (piece.color, type(piece))
+        counts[key] = counts.get(key, 0) + 1
+
+    sides = []
+    for i, color in enumerate(color_table(board)):
+        side = ""
+        for piece_type, letter in zip(PIECE_TYPES, LETTERS):
+            count = counts.get((color, piece_type), 0)
+            if count:
+                side += (letter if i == 0 else letter.lower()) + (str(count) if count > 1 else "")
+        sides.append(side)
+    return "/".join(sides)
+
+
+def material_key(signature: str, size: IntegerVector) -> int:
+    return zobrist_key("material", size, signature)
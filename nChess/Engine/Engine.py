@@ -0,0 +1,239 @@
+import time
+from typing import Callable
+
+from nChess.nBoard import nBoard, Color, Move
+from nChess.Engine.Evaluation import evaluate
+from nChess.Engine.TranspositionTable import TranspositionTable, Bound
+from nChess.Engine.MoveOrdering import MoveOrdering
+from nChess.Book.Book import Book
+
+Evaluator = Callable[[nBoard, Color], float]
+
+MATE = 100000
+INFINITY = float("inf")
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def score_to_table(score: float, ply: int) -> float:
+    """Mate scores are stored relative to the node, not the root."""
+    if score >= MATE - 1000:
+        return score + ply
+    if score <= -(MATE - 1000):
+        return score - ply
+    return score
+
+
+def score_from_table(score: float, ply: int) -> float:
+    if score >= MATE - 1000:
+        return score - ply
+    if score <= -(MATE - 1000):
+        return score + ply
+    return score
+
+
+class Engine:
+    """Negamax alpha-beta search with iterative deepening and aspiration windows.
+
+    Scores are from the point of view of the side to move; mates are scored as
+    MATE minus the distance in plies. Positions found in the book are not
+    searched.
+    """
+
+    evaluator: Evaluator
+    default_depth: int
+    aspiration_window: float
+    transposition_table: TranspositionTable
+    move_ordering: MoveOrdering
+    book: Book
+
+    nodes: int
+    depth_reached: int
+
+    def __init__(
+        self,
+        evaluator: Evaluator = evaluate,
+        default_depth: int = 3,
+        aspiration_window: float = 1,
+        transposition_table: TranspositionTable = None,
+        move_ordering: MoveOrdering = None,
+        book: Book = None
+    ):
+        self.evaluator = evaluator
+        self.default_depth = default_depth
+        self.aspiration_window = aspiration_window
+        self.transposition_table = transposition_table
+        self.move_ordering = move_ordering if move_ordering is not None else MoveOrdering()
+        self.book = book
+
+        self.nodes = 0
+        self.depth_reached = 0
+        self.deadline = None
+        self.pv_table = []
+        self.path = []
+        self.previous_pv = []
+
+    def new_game(self):
+        """Forgets everything learned from previous searches."""
+        self.previous_pv = []
+        self.move_ordering.clear()
+        if self.transposition_table is not None:
+            self.transposition_table.clear()
+
+    def search(
+        self,
+        board: nBoard,
+        depth: int = None,
+        time_limit: float = None
+    ) -> tuple[Move, float, list[Move]]:
+        """Searches board for the side to move up to depth plies or until time_limit
+        seconds have passed, whichever comes first, and returns the best move, its
+        score and the principal variation of the last completed iteration.
+
+        With neither depth nor time_limit, searches default_depth plies. A book
+        move is returned at once, with no score.
+        """
+        assert board.current_turn() is not None
+
+        if depth is None:
+            depth = self.default_depth if time_limit is None else 64
+
+        self.nodes = 0
+        self.depth_reached = 0
+
+        book_move = self.book_move(board)
+        if book_move is not None:
+            return book_move, None, [book_move]
+
+        self.new_search(board)
+
+        start = time.perf_counter()
+        best_move, score, pv = None, None, []
+
+        for iteration in range(1, depth + 1):
+            # The first iteration always completes, so there is a move to return.
+            deadline = start + time_limit if time_limit is not None and iteration > 1 else None
+
+            try:
+                score, pv = self.iterate(board, iteration, score, deadline)
+            except SearchTimeout:
+                break
+
+            best_move = pv[0] if pv else None
+            self.previous_pv = pv
+            self.depth_reached = iteration
+
+            if abs(score) >= MATE - depth:
+                break
+
+        return best_move, score, pv
+
+    def new_search(self, board: nBoard):
+        """Prepares a search of board."""
+        self.previous_pv = []
+        self.deadline = None
+        self.move_ordering.new_search()
+
+    def iterate(self, board: nBoard, depth: int, guess: float, deadline: float) -> tuple[float, list[Move]]:
+        """One iteration of the iterative deepening: the score and principal
+        variation of board searched depth plies deep, guess being the score of
+        the previous iteration. Raises SearchTimeout once time.perf_counter()
+        passes deadline."""
+        self.deadline = deadline
+        score = self.aspiration_search(board, depth, guess)
+        return score, list(self.pv_table[0])
+
+    def book_move(self, board: nBoard) -> Move:
+        return self.book.choose(board) if self.book is not None else None
+
+    def aspiration_search(self, board: nBoard, depth: int, guess: float) -> float:
+        if guess is None or abs(guess) >= MATE - depth:
+            return self.root_search(board, depth, -INFINITY, INFINITY)
+
+        window = self.aspiration_window
+        while True:
+            alpha, beta = guess - window, guess + window
+            score = self.root_search(board, depth, alpha, beta)
+            if alpha < score < beta:
+                return score
+            window *= 4
+            if window > MATE:
+                return self.root_search(board, depth, -INFINITY, INFINITY)
+
+    def root_search(self, board: nBoard, depth: int, alpha: float, beta: float) -> float:
+        self.pv_table = [[] for _ in range(depth + 1)]
+        self.path = []
+        return self.negamax(board, depth, 0, alpha, beta)
+
+    def negamax(self, board: nBoard, depth: int, ply: int, alpha: float, beta: float) -> float:
+        self.nodes += 1
+        if self.deadline is not None and self.nodes % 256 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        self.pv_table[ply] = []
+        color = board.current_turn()
+
+        if depth == 0:
+            return self.evaluator(board, color)
+
+        table = self.transposition_table
+        hash_move = None
+        original_alpha = alpha
+        if table is not None:
+            entry = table.probe(board)
+            if entry is not None:
+                entry_depth, bound, score, hash_move = entry
+                if ply > 0 and entry_depth >= depth:
+                    score = score_from_table(score, ply)
+                    if (
+                        bound is Bound.exact
+                        or bound is Bound.lower and score >= beta
+                        or bound is Bound.upper and score <= alpha
+                    ):
+                        return score
+
+        # Along the previous iteration's principal variation its move comes
+        # first; elsewhere the stored best move does.
+        if ply < len(self.previous_pv) and self.path == self.previous_pv[:ply]:
+            first_moves = (self.previous_pv[ply], hash_move)
+        else:
+            first_moves = (hash_move,)
+
+        best_score = -INFINITY
+        best_move = None
+        for move in self.move_ordering.moves(board, color, ply, first_moves):
+            record = board.make_move(move)
+            self.path.append(move)
+            try:
+                score = -self.negamax(board, depth - 1, ply + 1, -beta, -alpha)
+            finally:
+                self.path.pop()
+                board.unmake_move(record)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+                    if alpha >= beta:
+                        self.move_ordering.record_cutoff(board, move, depth, ply)
+                        break
+
+        if best_move is None:
+            return -(MATE - ply) if board.in_check(color) else 0
+
+        if table is not None:
+            if best_score <= original_alpha:
+                # Every move failed low, so none of them is known to be best.
+                bound = Bound.upper
+                best_move = hash_move
+            elif best_score >= beta:
+                bound = Bound.lower
+            else:
+                bound = Bound.exact
+            table.store(board, depth, bound, score_to_table(best_score, ply), best_move)
+
+        return best_score
@@ -0,0 +1,206 @@
+from collections import defaultdict
+from typing import Type
+
+from nChess.nBoard import nBoard, Color, Backend
+from nChess.Engine import PIECE_VALUES, doubled_pawns, blocked_pawns, isolated_pawns
+from nChess.Piece import Piece
+from nChess.Piece.Bishop import Bishop
+from nChess.Piece.King import King
+from nChess.Piece.Knight import Knight
+from nChess.Piece.Pawn import Pawn
+from nChess.Piece.Queen import Queen
+from nChess.Piece.Rook import Rook
+
+# Scores are summed in hundredths of a pawn so that they stay exact.
+CENTRALIZATION = {
+    King: -2,
+    Queen: 1,
+    Rook: 0,
+    Bishop: 2,
+    Knight: 4,
+}
+ADVANCEMENT = 5
+PAWN_STRUCTURE_PENALTY = 50
+
+
+def square_table(board: nBoard, piece_type: Type[Piece], direction: int) -> list[int]:
+    """Piece-square table of piece_type over the flat indices of board.
+
+    Pieces are rewarded for closeness to the center along every axis; pawns
+    for the distance covered along each forward axis.
+    """
+    table = []
+    for position in board.tables.positions:
+        if issubclass(piece_type, Pawn):
+            table.append(ADVANCEMENT * sum(
+                x if direction > 0 else size - 1 - x
+                for x, size in zip(position[1:], board.size[1:])
+            ))
+        else:
+            distance = sum(abs(2 * x - (size - 1)) for x, size in zip(position, board.size))
+            farthest = sum(size - 1 for size in board.size)
+            table.append(CENTRALIZATION.get(piece_type, 0) * (farthest - distance))
+    return table
+
+
+class Evaluation:
+    """Evaluation terms of a board kept up to date while pieces come and go.
+
+    Listens to the occupy/vacate notifications of its board, so make_move and
+    unmake_move keep it current at the cost of the pieces they touch. Holds,
+    per color: material by piece type, the piece-square sum, and the pawn
+    structure counters behind doubled_pawns, blocked_pawns and isolated_pawns.
+    """
+
+    board: nBoard
+    material: dict[tuple[Color, type], int]
+    positional: dict[Color, int]
+    doubled: dict[Color, int]
+    blocked: dict[Color, int]
+    isolated: dict[Color, int]
+
+    def __init__(self, board: nBoard):
+        self.board = board
+        self.tables = {}
+
+        self.material = defaultdict(int)
+        self.positional = defaultdict(int)
+
+        # Pawns per (color, forward axis, position without that coordinate).
+        self.lines = defaultdict(int)
+        self.doubled = defaultdict(int)
+        # Pawns per (color, file).
+        self.files = defaultdict(int)
+        self.isolated = defaultdict(int)
+        self.blocked = defaultdict(int)
+
+        for piece in board.pieces:
+            self.add(piece, board.flat_index(piece.position))
+        for piece in board.pieces:
+            if isinstance(piece, Pawn):
+                self.blocked[piece.color] += self.blockers(piece, board.flat_index(piece.position))
+
+        board.listeners.append(self)
+
+    @classmethod
+    def of(cls, board: nBoard) -> "Evaluation":
+        """The evaluation attached to board, attaching one on first use."""
+        for listener in board.listeners:
+            if isinstance(listener, cls):
+                return listener
+        return cls(board)
+
+    def detach(self):
+        self.board.listeners.remove(self)
+
+    def square_table(self, piece: Piece) -> list[int]:
+        key = (type(piece), piece.direction if isinstance(piece, Pawn) else 0)
+        table = self.tables.get(key)
+        if table is None:
+            table = self.tables[key] = square_table(self.board, *key)
+        return table
+
+    def occupy(self, piece: Piece, index: int):
+        self.add(piece, index)
+        self.update_blocked(piece, index, 1)
+
+    def vacate(self, piece: Piece, index: int):
+        self.add(piece, index, -1)
+        self.update_blocked(piece, index, -1)
+
+    def add(self, piece: Piece, index: int, sign: int = 1):
+        color = piece.color
+        self.material[color, type(piece)] += sign
+        self.positional[color] += sign * self.square_table(piece)[index]
+        if isinstance(piece, Pawn):
+            self.add_pawn(color, piece.position, sign)
+
+    def add_pawn(self, color: Color, position: tuple[int, ...], sign: int):
+        # Every other pawn on one of this pawn's lines makes two ordered pairs.
+        for axis in range(1, len(position)):
+            key = (color, axis, position[:axis] + position[axis + 1:])
+            if sign < 0:
+                self.lines[key] -= 1
+            self.doubled[color] += sign * 2 * self.lines[key]
+            if sign > 0:
+                self.lines[key] += 1
+
+        file = position[0]
+        neighbourhood = (file - 1, file, file + 1)
+        self.isolated[color] -= sum(self.isolated_on(color, f) for f in neighbourhood)
+        self.files[color, file] += sign
+        self.isolated[color] += sum(self.isolated_on(color, f) for f in neighbourhood)
+
+    def isolated_on(self, color: Color, file: int) -> int:
+        files = self.files
+        if files.get((color, file - 1)) or files.get((color, file + 1)):
+            return 0
+        return files.get((color, file), 0)
+
+    def blockers(self, pawn: Pawn, index: int) -> int:
+        """Occupied squares one step ahead of pawn."""
+        occupancy = self.board.occupancy
+        return sum(
+            1 for ray in self.board.tables.pawn_pushes(index, pawn.direction, pawn.capture_axis)
+            if occupancy[ray[0]]
+        )
+
+    def update_blocked(self, piece: Piece, index: int, sign: int):
+        if isinstance(piece, Pawn):
+            self.blocked[piece.color] += sign * self.blockers(piece, index)
+
+        # Pawns one step behind piece along one of their forward axes.
+        occupants = self.board.occupants
+        position = piece.position
+        for axis in range(len(position)):
+            for step in (-1, 1):
+                behind = position[:axis] + (position[axis] + step,) + position[axis + 1:]
+                pawn = occupants.get(behind)
+                if (
+                    isinstance(pawn, Pawn)
+                    and pawn.direction == -step
+                    and pawn.capture_axis != axis
+                ):
+                    self.blocked[pawn.color] += sign
+
+    def score(self, color: Color) -> int:
+        """Score of color alone, in hundredths of a pawn."""
+        return (
+            100 * sum(value * self.material[color, piece_type] for piece_type, value in PIECE_VALUES.items())
+            + self.positional[color]
+            - PAWN_STRUCTURE_PENALTY * (self.doubled[color] + self.blocked[color] + self.isolated[color])
+        )
+
+    def evaluate(self, color: Color) -> float:
+        return (self.score(color) - sum(self.score(rival) for rival in self.board.turn_order if rival != color)) / 100
+
+
+def positional(board: nBoard, color: Color) -> int:
+    return sum(
+        square_table(board, type(piece), piece.direction if isinstance(piece, Pawn) else 0)[board.flat_index(piece.position)]
+        for piece in board.pieces
+        if piece.color == color
+    )
+
+
+def evaluate_from_scratch(board: nBoard, color: Color) -> float:
+    """Same terms as Evaluation.evaluate, recomputed from the pieces on board."""
+    def score(color: Color) -> int:
+        return (
+            100 * sum(value * sum(1 for piece in board.pieces if type(piece) is piece_type and piece.color == color)
+                      for piece_type, value in PIECE_VALUES.items())
+            + positional(board, color)
+            - PAWN_STRUCTURE_PENALTY * (
+                doubled_pawns(board, color) + blocked_pawns(board, color) + isolated_pawns(board, color)
+            )
+        )
+
+    return (score(color) - sum(score(rival) for rival in board.turn_order if rival != color)) / 100
+
+
+def evaluate(board: nBoard, color: Color) -> float:
+    """Incremental evaluation; cross-checked from scratch on Backend.cross_check boards."""
+    score = Evaluation.of(board).evaluate(color)
+    if board.backend is Backend.cross_check:
+        assert score == evaluate_from_scratch(board, color), (score, evaluate_from_scratch(board, color))
+    return score
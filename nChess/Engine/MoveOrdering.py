@@ -0,0 +1,123 @@
+from typing import Iterator
+
+from nChess.nBoard import nBoard, Color, CheckInfo, Move
+from nChess.Engine import PIECE_VALUES
+
+KILLER_SLOTS = 2
+
+
+class MoveOrdering:
+    """Yields legal moves in the order alpha-beta is most likely to cut off on:
+    first moves (principal variation, hash move), captures by MVV-LVA, killer
+    moves of the ply, then quiet moves by history score.
+
+    Generation is staged: quiet moves are only generated once every capture and
+    killer has been tried, so an early cutoff never pays for them.
+    """
+
+    killers: list[list[Move]]
+    history: dict[tuple[type, int, int], int]
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.killers = []
+        self.history = {}
+
+    def new_search(self):
+        """Killers are tied to plies of the previous search; history only fades."""
+        self.killers = []
+        for key in self.history:
+            self.history[key] //= 2
+
+    def ply_killers(self, ply: int) -> list[Move]:
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        return self.killers[ply]
+
+    def history_key(self, board: nBoard, move: Move) -> tuple[type, int, int]:
+        return (
+            type(board.get(move.initial_position)),
+            board.flat_index(move.initial_position),
+            board.flat_index(move.final_position)
+        )
+
+    @staticmethod
+    def capture_score(board: nBoard, move: Move) -> tuple[float, float]:
+        """Most valuable victim first, then least valuable attacker."""
+        victim = PIECE_VALUES.get(type(board.get(move.final_position)), 0)
+        attacker = PIECE_VALUES.get(type(board.get(move.initial_position)), 0)
+        return victim, -attacker
+
+    @staticmethod
+    def is_pseudo_legal(board: nBoard, move: Move, color: Color, captures: bool = True, quiets: bool = True) -> bool:
+        if not board.contains(move.initial_position):
+            return False
+        piece = board.get(move.initial_position)
+        return piece.color == color and move in board.pseudo_moves(piece, captures, quiets)
+
+    def moves(
+        self,
+        board: nBoard,
+        color: Color,
+        ply: int,
+        first_moves: tuple[Move, ...] = (),
+        check_info: CheckInfo = None
+    ) -> Iterator[Move]:
+        """Legal moves of color, best candidates first.
+
+        The caller may make and unmake moves between iterations as long as the
+        board is back to its original state when the next move is requested.
+        """
+        if check_info is None:
+            check_info = board.check_info(color)
+        pieces = [piece for piece in board.pieces if piece.color == color]
+        tried = set()
+
+        for move in first_moves:
+            if (
+                move is not None
+                and move not in tried
+                and self.is_pseudo_legal(board, move, color)
+                and board.is_legal(move, check_info)
+            ):
+                tried.add(move)
+                yield move
+
+        captures = [move for piece in pieces for move in board.pseudo_moves(piece, quiets=False)]
+        captures.sort(key=lambda move: self.capture_score(board, move), reverse=True)
+        for move in captures:
+            if move not in tried and board.is_legal(move, check_info):
+                tried.add(move)
+                yield move
+
+        for move in tuple(self.ply_killers(ply)):
+            if (
+                move not in tried
+                and self.is_pseudo_legal(board, move, color, captures=False)
+                and board.is_legal(move, check_info)
+            ):
+                tried.add(move)
+                yield move
+
+        quiets = [move for piece in pieces for move in board.pseudo_moves(piece, captures=False)]
+        history = self.history
+        quiets.sort(key=lambda move: history.get(self.history_key(board, move), 0), reverse=True)
+        for move in quiets:
+            if move not in tried and board.is_legal(move, check_info):
+                yield move
+
+    def record_cutoff(self, board: nBoard, move: Move, depth: int, ply: int):
+        """Rewards a quiet move that caused a beta cutoff; board is the position
+        the move was played from."""
+        if board.contains(move.final_position):
+            return
+
+        killers = self.ply_killers(ply)
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLER_SLOTS:]
+
+        key = self.history_key(board, move)
+        self.history[key] = self.history.get(key, 0) + depth * depth
@@ -0,0 +1,220 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Value
+
+from nChess.nBoard import nBoard, Move
+from nChess.Book.Book import Book
+from nChess.Engine.Engine import Engine, Evaluator, SearchTimeout, MATE, INFINITY
+from nChess.Engine.Evaluation import evaluate
+from nChess.Engine.TranspositionTable import TranspositionTable
+
+# State of a worker process, set up once by initialize().
+worker_engine: Engine = None
+worker_alpha = None
+
+
+def initialize(evaluator: Evaluator, megabytes: float, alpha):
+    global worker_engine, worker_alpha
+    transposition_table = TranspositionTable(megabytes) if megabytes else None
+    worker_engine = Engine(evaluator, transposition_table=transposition_table)
+    worker_alpha = alpha
+
+
+def search_root_moves(
+    board: nBoard,
+    moves: list[Move],
+    depth: int,
+    deadline: float
+) -> tuple[list[tuple[Move, float, bool, list[Move]]], int]:
+    """Searches moves of the root board depth plies deep, one after the other,
+    in a worker.
+
+    The lower bound of each search is the best root score found so far by any
+    process. Returns the (move, score, exact, pv) of every move, exact being
+    False when the move failed low, and the nodes searched; the results are
+    None if the deadline passed.
+    """
+    engine = worker_engine
+    engine.nodes = 0
+    engine.deadline = None if deadline is None else time.perf_counter() + deadline - time.time()
+
+    results = []
+    for move in moves:
+        alpha = worker_alpha.value
+        engine.pv_table = [[] for _ in range(depth + 1)]
+        engine.previous_pv = []
+        engine.path = [move]
+
+        record = board.make_move(move)
+        try:
+            score = -engine.negamax(board, depth - 1, 1, -INFINITY, -alpha)
+        except SearchTimeout:
+            return None, engine.nodes
+        board.unmake_move(record)
+
+        with worker_alpha.get_lock():
+            if score > worker_alpha.value:
+                worker_alpha.value = score
+        results.append((move, score, score > alpha, [move] + engine.pv_table[1]))
+
+    return results, engine.nodes
+
+
+class ParallelEngine(Engine):
+    """Root-split search over a process pool.
+
+    Iterations shallower than parallel_depth, whose searches cost less than
+    handing them out, run in this process. Deeper ones search the first root
+    move here, within an aspiration window around the previous score, then
+    split the remaining moves into one batch per worker, each worker with its
+    own transposition table and move ordering kept across searches. The best
+    score found so far is shared through a synchronized value and used as the
+    lower bound of every root move search that starts after it. Boards travel
+    to the workers in their compact pickled form, once per batch.
+    """
+
+    workers: int
+    parallel_depth: int
+    seconds: float
+
+    def __init__(
+        self,
+        evaluator: Evaluator = evaluate,
+        default_depth: int = 3,
+        workers: int = None,
+        megabytes: float = 16,
+        book: Book = None,
+        parallel_depth: int = 4
+    ):
+        super().__init__(
+            evaluator,
+            default_depth,
+            transposition_table=TranspositionTable(megabytes) if megabytes else None,
+            book=book
+        )
+        self.workers = workers or os.cpu_count()
+        self.parallel_depth = parallel_depth
+        self.megabytes = megabytes
+        self.seconds = 0
+        self.root_moves = []
+
+        self.alpha = Value("d", -INFINITY)
+        self.pool = None
+
+    def __enter__(self) -> "ParallelEngine":
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def new_game(self):
+        super().new_game()
+        self.close()
+
+    def executor(self) -> ProcessPoolExecutor:
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                self.workers,
+                initializer=initialize,
+                initargs=(self.evaluator, self.megabytes, self.alpha)
+            )
+        return self.pool
+
+    def search(
+        self,
+        board: nBoard,
+        depth: int = None,
+        time_limit: float = None
+    ) -> tuple[Move, float, list[Move]]:
+        start = time.perf_counter()
+        result = super().search(board, depth, time_limit)
+        self.seconds = time.perf_counter() - start
+        return result
+
+    def new_search(self, board: nBoard):
+        super().new_search(board)
+        self.root_moves = list(self.move_ordering.moves(board, board.current_turn(), 0))
+
+    def iterate(self, board: nBoard, depth: int, guess: float, deadline: float) -> tuple[float, list[Move]]:
+        moves = self.root_moves
+        if not moves:
+            return -MATE if board.in_check(board.current_turn()) else 0, []
+
+        if depth < self.parallel_depth or len(moves) < 2 or self.workers < 2:
+            score, pv = super().iterate(board, depth, guess, deadline)
+            if pv:
+                moves.remove(pv[0])
+                moves.insert(0, pv[0])
+            return score, pv
+
+        self.deadline = deadline
+        first_score, first_pv = self.search_first(board, moves[0], depth, guess)
+
+        # Workers compare the deadline against their own clocks.
+        if deadline is not None:
+            deadline = time.time() + deadline - time.perf_counter()
+
+        scores = self.root_split(board, moves[1:], depth, deadline, first_score)
+        if scores is None:
+            raise SearchTimeout
+
+        scores[moves[0]] = first_score, first_pv
+        moves.sort(key=lambda move: scores[move][0], reverse=True)
+        return scores[moves[0]]
+
+    def search_first(self, board: nBoard, move: Move, depth: int, guess: float) -> tuple[float, list[Move]]:
+        """Score and principal variation of the first root move, searched in
+        this process within an aspiration window around guess."""
+        window = self.aspiration_window
+        if guess is None or abs(guess) >= MATE - depth:
+            alpha, beta = -INFINITY, INFINITY
+        else:
+            alpha, beta = guess - window, guess + window
+
+        self.pv_table = [[] for _ in range(depth + 1)]
+        self.path = [move]
+        record = board.make_move(move)
+        try:
+            while True:
+                score = -self.negamax(board, depth - 1, 1, -beta, -alpha)
+                if alpha < score < beta or (alpha, beta) == (-INFINITY, INFINITY):
+                    break
+                alpha, beta = -INFINITY, INFINITY
+        finally:
+            board.unmake_move(record)
+        return score, [move] + self.pv_table[1]
+
+    def root_split(
+        self,
+        board: nBoard,
+        moves: list[Move],
+        depth: int,
+        deadline: float,
+        alpha: float
+    ) -> dict[Move, tuple[float, list[Move]]]:
+        """Score and principal variation of each of moves, searched in one batch
+        per worker with alpha as the first lower bound; moves that failed low
+        score -INFINITY. None if the deadline passed."""
+        pool = self.executor()
+        self.alpha.value = alpha
+        batches = [moves[i::self.workers] for i in range(min(self.workers, len(moves)))]
+        futures = [pool.submit(search_root_moves, board, batch, depth, deadline) for batch in batches]
+
+        scores = {}
+        timed_out = False
+        for future in futures:
+            results, nodes = future.result()
+            self.nodes += nodes
+            if results is None:
+                timed_out = True
+                continue
+            for move, score, exact, pv in results:
+                scores[move] = (score, pv) if exact else (-INFINITY, [move])
+
+        return None if timed_out else scores
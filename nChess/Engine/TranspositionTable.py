@@ -0,0 +1,126 @@
+from array import array
+from enum import IntEnum
+
+from nChess.nBoard import nBoard, Move
+
+
+class Bound(IntEnum):
+    exact = 0
+    lower = 1
+    upper = 2
+
+
+NO_MOVE = -1
+
+# key (Q), depth (b), bound (b), score (d), move (q)
+ENTRY_SIZE = 8 + 1 + 1 + 8 + 8
+BUCKET_SIZE = 2
+
+
+class TranspositionTable:
+    """Fixed-size transposition table kept in parallel typed arrays.
+
+    Entries live in buckets of two slots indexed by the low bits of the Zobrist
+    key: the first slot keeps the deepest search seen for its bucket, the second
+    one takes the latest entry, or the one a deeper search displaced. Moves are packed as
+    from_index * cells + to_index.
+    """
+
+    megabytes: float
+    buckets: int
+
+    hits: int
+    misses: int
+    collisions: int
+
+    def __init__(self, megabytes: float = 16):
+        self.megabytes = megabytes
+
+        buckets = max(1, int(megabytes * 1024 * 1024) // (ENTRY_SIZE * BUCKET_SIZE))
+        self.buckets = 1 << (buckets.bit_length() - 1)
+        self.mask = self.buckets - 1
+
+        self.clear()
+
+    def __len__(self) -> int:
+        return sum(1 for depth in self.depths if depth >= 0)
+
+    def clear(self):
+        slots = self.buckets * BUCKET_SIZE
+        self.keys = array("Q", bytes(8 * slots))
+        self.depths = array("b", b"\xff" * slots)
+        self.bounds = array("b", bytes(slots))
+        self.scores = array("d", bytes(8 * slots))
+        self.moves = array("q", [NO_MOVE]) * slots
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    @staticmethod
+    def pack_move(board: nBoard, move: Move) -> int:
+        if move is None:
+            return NO_MOVE
+        return board.tables.pack(move)
+
+    @staticmethod
+    def unpack_move(board: nBoard, packed_move: int) -> Move:
+        if packed_move == NO_MOVE:
+            return None
+        return board.tables.unpack(packed_move)
+
+    def probe(self, board: nBoard) -> tuple[int, Bound, float, Move]:
+        """The (depth, bound, score, move) stored for board, or None."""
+        key = board.hash_key
+        slot = (key & self.mask) * BUCKET_SIZE
+        occupied = False
+        for slot in (slot, slot + 1):
+            depth = self.depths[slot]
+            if depth < 0:
+                continue
+            if self.keys[slot] == key:
+                self.hits += 1
+                return depth, Bound(self.bounds[slot]), self.scores[slot], self.unpack_move(board, self.moves[slot])
+            occupied = True
+
+        self.misses += 1
+        if occupied:
+            self.collisions += 1
+        return None
+
+    def store(self, board: nBoard, depth: int, bound: Bound, score: float, move: Move):
+        key = board.hash_key
+        slot = (key & self.mask) * BUCKET_SIZE
+        depth = min(depth, 127)
+
+        # Same position or a shallower search in the depth-preferred slot:
+        # replace it there, moving another position's entry down to the
+        # always-replace slot; anything else goes to the always-replace slot.
+        if self.keys[slot] != key and depth < self.depths[slot]:
+            slot += 1
+        elif self.keys[slot] != key and self.depths[slot] >= 0:
+            self.move_entry(slot, slot + 1)
+        elif self.keys[slot + 1] == key:
+            self.depths[slot + 1] = -1
+
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.bounds[slot] = bound
+        self.scores[slot] = score
+        self.moves[slot] = self.pack_move(board, move)
+
+    def move_entry(self, source: int, target: int):
+        self.keys[target] = self.keys[source]
+        self.depths[target] = self.depths[source]
+        self.bounds[target] = self.bounds[source]
+        self.scores[target] = self.scores[source]
+        self.moves[target] = self.moves[source]
+
+    def statistics(self) -> dict[str, float]:
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "hit_rate": self.hits / probes if probes else 0,
+        }
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+from nChess.bench import position
+from nChess.Piece import move_name
+from nChess.Book.Book import Book
+from nChess.Engine.Engine import Engine
+from nChess.Engine.Parallel import ParallelEngine
+from nChess.Engine.TranspositionTable import TranspositionTable
+
+
+def main():
+    parser = ArgumentParser(prog="python -m nChess.Engine", description="Searches a start position.")
+    parser.add_argument("position", nargs="?", default="classic", help="classic, tesseract or hypercube:<dimension>:<side>")
+    parser.add_argument("-d", "--depth", type=int, help="maximum depth (default: 3, or unbounded with --time)")
+    parser.add_argument("-t", "--time", type=float, help="time limit in seconds")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--parallel-depth", type=int, default=4, help="shallowest iteration split across the workers (default: 4)")
+    parser.add_argument("--megabytes", type=float, default=16, help="transposition table size per engine")
+    parser.add_argument("--compare", action="store_true", help="also run the single-process search and report the speedup or slowdown")
+    parser.add_argument("--book", help="opening book to play from before searching")
+    arguments = parser.parse_args()
+
+    def report(name, engine, seconds, result):
+        best_move, score, pv = result
+        if score is None:
+            print(f"{name}: book move {move_name(best_move)}", file=sys.stderr)
+            return
+        print(
+            f"{name}: depth {engine.depth_reached}, best {move_name(best_move) if best_move else None}, "
+            f"score {score}, {engine.nodes} nodes in {seconds:.3f}s ({engine.nodes / seconds:.0f} nodes/s)",
+            file=sys.stderr
+        )
+        print(f"  pv {' '.join(map(move_name, pv))}", file=sys.stderr)
+
+    board = position(arguments.position)
+    book = Book(arguments.book) if arguments.book else None
+    with ParallelEngine(
+        workers=arguments.workers,
+        megabytes=arguments.megabytes,
+        book=book,
+        parallel_depth=arguments.parallel_depth
+    ) as engine:
+        result = engine.search(board, arguments.depth, arguments.time)
+        report(f"{engine.workers} workers", engine, engine.seconds, result)
+        parallel_seconds = engine.seconds
+
+    if arguments.compare:
+        engine = Engine(transposition_table=TranspositionTable(arguments.megabytes), book=book)
+        start = time.perf_counter()
+        result = engine.search(board, arguments.depth, arguments.time)
+        seconds = time.perf_counter() - start
+        report("1 process", engine, seconds, result)
+        if parallel_seconds >= seconds:
+            print(f"slowdown {parallel_seconds / seconds:.2f}x: the single process finished first", file=sys.stderr)
+        elif parallel_seconds:
+            print(f"speedup {seconds / parallel_seconds:.2f}x", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ HIGHLIGHT = (0.9, 0.9, 0, 1)
 
 
 class CellWidget(GridLayout):
+    """A square of a board widget. Its background is a single Rectangle whose
+    Color is changed in place when the cell is highlighted."""
+
     color: "Color"
     piece_widget: PieceWidget
     highlighted: bool
@@ -23,7 +26,12 @@ class CellWidget(GridLayout):
         self.piece_widget = None
         self.highlighted = False
 
-        self.draw_color()
+        with self.canvas.before:
+            self.background_color = Color(*self.color)
+            self.background = Rectangle(
+                pos=(self.x, self.y),
+                size=(self.width, self.height)
+            )
 
         self.bind(pos=self.update_cell)
         self.bind(size=self.update_cell)
@@ -42,20 +50,10 @@ class CellWidget(GridLayout):
         self.highlighted = not self.highlighted
 
     def draw_color(self):
-        with self.canvas.before:
-            Color(*self.color)
-            self.background = Rectangle(
-                pos=(self.x, self.y),
-                size=(self.width, self.height)
-            )
+        self.background_color.rgba = self.color
 
     def draw_highlight(self):
-        with self.canvas.before:
-            Color(*HIGHLIGHT)
-            self.background = Rectangle(
-                pos=(self.x, self.y),
-                size=(self.width, self.height)
-            )
+        self.background_color.rgba = HIGHLIGHT
 
     def update_cell(self, *args, **kwargs):
         self.background.pos = (self.x, self.y)
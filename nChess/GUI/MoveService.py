@@ -0,0 +1,142 @@
+import itertools
+import queue
+import threading
+from typing import Any, Callable
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+from nChess.nBoard import nBoard, IntegerVector, Color
+from nChess.nBoard.Encoding import color_type
+from nChess.Piece import Move
+from nChess.Engine.Engine import Engine
+
+# Queue priorities: requests run before speculative work.
+REQUEST = 0
+SPECULATIVE = 1
+STOP = -1
+
+
+class MoveService:
+    """Computes legal moves and engine replies on a worker thread, so that the
+    Kivy main thread never waits for them.
+
+    Every job runs on a snapshot of the board taken when it is submitted, and
+    its result is posted back to the main thread through Clock.schedule_once; a
+    job that raises is logged and skipped, and the worker goes on. A
+    request cancels the pending one of the same kind ("moves", "reply" or
+    "speculative"); cancelled jobs are skipped and their results dropped.
+    precompute() fills the legal move cache for a side while the user is idle,
+    and request_moves() answers from it when it can. Move jobs of the same
+    position share one snapshot, so they also share its legal_moves_from cache.
+    """
+
+    engine: Engine
+    # Legal moves by (hash_key, position) of the boards they were computed for.
+    moves: dict[tuple[int, IntegerVector], tuple[Move, ...]]
+    position_key: int
+    # Snapshot of the board whose hash_key is position_key.
+    position: nBoard
+    tokens: dict[str, int]
+
+    def __init__(self, engine: Engine = None):
+        self.engine = engine if engine is not None else Engine()
+        self.moves = {}
+        self.position_key = None
+        self.position = None
+        self.tokens = {"moves": 0, "reply": 0, "speculative": 0}
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+
+        self.thread = threading.Thread(target=self.run, name="MoveService", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        for kind in self.tokens:
+            self.cancel(kind)
+        self.queue.put((STOP, next(self.sequence), None))
+        self.thread.join()
+
+    @staticmethod
+    def snapshot(board: nBoard) -> nBoard:
+        return nBoard.from_bytes(board.to_bytes(), color_type(board))
+
+    def position_snapshot(self, board: nBoard) -> nBoard:
+        """The shared snapshot of board's position; moves cached for earlier
+        positions are dropped."""
+        key = board.hash_key
+        if key != self.position_key:
+            self.moves = {}
+            self.position_key = key
+            self.position = self.snapshot(board)
+        return self.position
+
+    def cancel(self, kind: str):
+        self.tokens[kind] += 1
+
+    def submit(self, priority: int, kind: str, work: Callable[[], Any], callback: Callable[[Any], None] = None):
+        self.queue.put((priority, next(self.sequence), (kind, self.tokens[kind], work, callback)))
+
+    def run(self):
+        while True:
+            priority, _, job = self.queue.get()
+            if priority == STOP:
+                return
+
+            kind, token, work, callback = job
+            if token != self.tokens[kind]:
+                continue
+            try:
+                result = work()
+            except Exception:
+                Logger.exception(f"MoveService: {kind} job failed")
+                continue
+            if callback is not None:
+                Clock.schedule_once(lambda dt, job=(kind, token, callback, result): self.deliver(*job))
+
+    def deliver(self, kind: str, token: int, callback: Callable[[Any], None], result: Any):
+        if token == self.tokens[kind]:
+            callback(result)
+
+    def legal_moves(self, board: nBoard, key: int, position: IntegerVector) -> tuple[Move, ...]:
+        moves = self.moves.get((key, position))
+        if moves is None:
+            moves = self.moves[key, position] = board.legal_moves_from(position)
+        return moves
+
+    def request_moves(self, board: nBoard, position: IntegerVector, callback: Callable[[tuple[Move, ...]], None]):
+        """Calls back with the legal moves of the piece on position, at once if
+        they are cached."""
+        self.cancel("moves")
+        key = board.hash_key
+        moves = self.moves.get((key, position))
+        if moves is not None:
+            callback(moves)
+            return
+
+        snapshot = self.position_snapshot(board)
+        self.submit(REQUEST, "moves", lambda: self.legal_moves(snapshot, key, position), callback)
+
+    def request_reply(
+        self,
+        board: nBoard,
+        callback: Callable[[Move], None],
+        depth: int = None,
+        time_limit: float = None
+    ):
+        """Calls back with the engine's best move for the side to move."""
+        self.cancel("reply")
+        snapshot = self.snapshot(board)
+        self.submit(REQUEST, "reply", lambda: self.engine.search(snapshot, depth, time_limit)[0], callback)
+
+    def precompute(self, board: nBoard, color: Color = None):
+        """Queues the legal moves of every piece of color, or of every piece if
+        color is None, one job per piece so that requests are served in
+        between. Moves cached for earlier positions are dropped."""
+        self.cancel("speculative")
+        key = board.hash_key
+        snapshot = self.position_snapshot(board)
+        for piece in board.pieces:
+            if (color is None or piece.color == color) and (key, piece.position) not in self.moves:
+                position = piece.position
+                self.submit(SPECULATIVE, "speculative", lambda position=position: self.legal_moves(snapshot, key, position))
@@ -1,6 +1,30 @@
+from kivy.core.image import Image as CoreImage
+from kivy.graphics.texture import Texture
 from kivy.uix.image import Image
 
+# Textures of the utils.PNG assets, loaded once and shared by every PieceWidget.
+textures: dict[str, Texture] = {}
+
+
+def load_texture(asset: str) -> Texture:
+    texture = textures.get(asset)
+    if texture is None:
+        texture = textures[asset] = CoreImage(asset).texture
+    return texture
+
+
 class PieceWidget(Image):
+    asset: str
+
+    def __init__(self, asset: str, **kwargs):
+        super().__init__(**kwargs)
+        self.set_asset(asset)
+
+    def set_asset(self, asset: str):
+        if getattr(self, "asset", None) != asset:
+            self.asset = asset
+            self.texture = load_texture(asset)
+
     def on_touch_up(self, touch):
         if self.collide_point(*touch.pos):
             self.parent.handle_touch(self)
@@ -1,19 +1,38 @@
 from nChess.GUI.CellWidget import CellWidget
 from kivy.uix.gridlayout import GridLayout
 
-from nChess.nBoard import nBoard, IntegerVector
-from nChess.Piece import Move
+from nChess.nBoard import nBoard, IntegerVector, Color
+from nChess.Piece import Move, Piece
 from nChess.GUI.BoardWidget import BoardWidget
+from nChess.GUI.MoveService import MoveService
 from nChess.GUI.PieceWidget import PieceWidget
 from nChess.utils import to_PNG
 
 
 class nBoardWidget(GridLayout): 
+    """Board widgets of the 2-d slices of an nBoard.
+
+    The widget listens to the board's occupy/vacate notifications and keeps the
+    flat indices of the squares that changed in dirty; refresh() brings only
+    those cells up to date, reusing the piece widgets it takes off the board.
+
+    Legal moves come from a MoveService: the cells of a selected piece's moves
+    are highlighted when they arrive. Moves are played with force, which leaves
+    the board's turn alone, so the widget tracks the side to move itself for
+    the service's precomputation.
+    """
+
     n_board: nBoard
     boards_widgets: list[BoardWidget]
     selected_position: IntegerVector
-
-    def __init__(self, n_board: nBoard, **kwargs):
+    side_to_move: Color
+    move_service: MoveService
+    # Moves of the selected piece whose cells are highlighted.
+    shown_moves: tuple[Move, ...]
+    dirty: set[int]
+    spare_piece_widgets: list[PieceWidget]
+
+    def __init__(self, n_board: nBoard, move_service: MoveService = None, **kwargs):
         super().__init__(**kwargs)
         self.spacing = [10, 10]
         self.padding = [10, 10]
@@ -40,9 +59,17 @@ class nBoardWidget(GridLayout):
                 self.add_widget(board_widget)
 
         self.selected_position = None
+        self.side_to_move = self.n_board.current_turn()
+        self.move_service = move_service if move_service is not None else MoveService()
+        self.shown_moves = ()
 
         for piece in self.n_board.pieces:
-            self.set_piece_widget(PieceWidget(source=to_PNG(piece)), piece.position)
+            self.set_piece_widget(PieceWidget(to_PNG(piece)), piece.position)
+
+        self.dirty = set()
+        self.spare_piece_widgets = []
+        self.n_board.listeners.append(self)
+        self.move_service.precompute(self.n_board, self.side_to_move)
 
     def position_padding(self, position: IntegerVector) -> IntegerVector:
         if len(position) < 4:
@@ -68,14 +95,39 @@ class nBoardWidget(GridLayout):
         position = self.position_padding(position)
         self.get_board_widget(position).remove_piece_widget(position[:2])
 
-    def move_piece_widget(self, move: Move):
-        source = self.get_piece_widget(move.initial_position).source
-        self.remove_piece_widget(move.initial_position)
-        
-        if self.has_piece_widget(move.final_position):
-            self.remove_piece_widget(move.final_position)
-
-        self.set_piece_widget(PieceWidget(source=source), move.final_position)
+    def next_color(self, color: Color) -> Color:
+        """The color after color in the turn order, or None without one."""
+        turn_order = self.n_board.turn_order
+        if not turn_order:
+            return None
+        return turn_order[(turn_order.index(color) + 1) % len(turn_order)]
+
+    def occupy(self, piece: Piece, index: int):
+        self.dirty.add(index)
+
+    def vacate(self, piece: Piece, index: int):
+        self.dirty.add(index)
+
+    def refresh(self):
+        """Updates the cells of the squares changed since the last refresh."""
+        positions = self.n_board.tables.positions
+        occupants = self.n_board.occupants
+        for index in self.dirty:
+            position = positions[index]
+            piece = occupants.get(position)
+            if piece is None:
+                if self.has_piece_widget(position):
+                    self.spare_piece_widgets.append(self.get_piece_widget(position))
+                    self.remove_piece_widget(position)
+            elif self.has_piece_widget(position):
+                self.get_piece_widget(position).set_asset(to_PNG(piece))
+            elif self.spare_piece_widgets:
+                piece_widget = self.spare_piece_widgets.pop()
+                piece_widget.set_asset(to_PNG(piece))
+                self.set_piece_widget(piece_widget, position)
+            else:
+                self.set_piece_widget(PieceWidget(to_PNG(piece)), position)
+        self.dirty.clear()
 
     def get_cell(self, position: IntegerVector) -> CellWidget:
         position = self.position_padding(position)
@@ -106,15 +158,24 @@ class nBoardWidget(GridLayout):
         assert self.has_piece_widget(position)
 
         self.toggle_cell_widget_highlight(position)
-        for move in self.n_board.get(position).moves():
+        self.move_service.request_moves(self.n_board, position, lambda moves: self.show_moves(position, moves))
+
+    def show_moves(self, position: IntegerVector, moves: tuple[Move, ...]):
+        if position != self.selected_position:
+            return
+
+        self.shown_moves = moves
+        for move in moves:
             self.toggle_cell_widget_highlight(move.final_position)
 
     def unselect_piece(self, position: IntegerVector):
         assert self.has_piece_widget(position)
 
+        self.move_service.cancel("moves")
         self.toggle_cell_widget_highlight(position)
-        for move in self.n_board.get(position).moves():
+        for move in self.shown_moves:
             self.toggle_cell_widget_highlight(move.final_position)
+        self.shown_moves = ()
 
     def handle_touch(self, board_widget: BoardWidget, in_board_widget_position):
         position = self.reconstruct_position(board_widget, in_board_widget_position)
@@ -123,19 +184,21 @@ class nBoardWidget(GridLayout):
             if position == self.selected_position:
                 self.unselect_piece(self.selected_position)
                 self.selected_position = None
-            elif (move := Move(self.selected_position, position)) in self.n_board.get(self.selected_position).moves():
+            elif (move := Move(self.selected_position, position)) in self.shown_moves:
                 self.unselect_piece(self.selected_position)
                 self.selected_position = None
-                self.move_piece_widget(move)
                 self.n_board.move(move, force=True)
+                self.refresh()
+                self.side_to_move = self.next_color(self.n_board.get(move.final_position).color)
+                self.move_service.precompute(self.n_board, self.side_to_move)
             elif self.has_piece_widget(position):
                 self.unselect_piece(self.selected_position)
-                self.select_piece(position)
                 self.selected_position = position
+                self.select_piece(position)
             else:
                 self.unselect_piece(self.selected_position)
                 self.selected_position = None
         else:
             if self.has_piece_widget(position):
-                self.select_piece(position)
                 self.selected_position = position
+                self.select_piece(position)
@@ -16,3 +16,6 @@ class nChessApp(App):
 
     def build(self):
         return self.n_board_widget
+
+    def on_stop(self):
+        self.n_board_widget.move_service.close()
@@ -1,11 +1,20 @@
-from nChess.nBoard import nBoard, IntegerVector, Move
+from typing import Iterator
+
+from nChess.nBoard import Move
 from nChess.Piece import Piece
 
 
 class Bishop(Piece):
     """Implements the Bishop piece and its generalization for higher dimensions."""
 
+    __slots__ = ()
+
     is_promotable = staticmethod(lambda: False)
 
-    def all_moves(self) -> tuple["Move", ...]:
-        return self.ad_nauseam(self.board.diagonals, max(self.board.size) - 1)
+    def all_moves(self, captures: bool = True, quiets: bool = True) -> tuple["Move", ...]:
+        index = self.board.flat_index(self.position)
+        return self.slide(self.board.tables.diagonal_rays(index), captures, quiets)
+
+    def iter_moves(self) -> Iterator["Move"]:
+        index = self.board.flat_index(self.position)
+        return self.iter_slide(self.board.tables.diagonal_rays(index))
@@ -1,11 +1,13 @@
-from nChess.nBoard import nBoard, IntegerVector, Move
+from nChess.nBoard import Move
 from nChess.Piece import Piece
 
 
 class King(Piece):
     """Implements the King piece and its generalization for higher dimensions."""
 
+    __slots__ = ()
+
     is_promotable = staticmethod(lambda: False)
 
-    def all_moves(self) -> tuple["Move", ...]:
-        return self.ad_nauseam(self.board.cardinals + self.board.diagonals, 1)
+    def all_moves(self, captures: bool = True, quiets: bool = True) -> tuple["Move", ...]:
+        return self.leap(self.board.tables.king_targets(self.board.flat_index(self.position)), captures, quiets)
@@ -1,6 +1,6 @@
 from typing import Type
 
-from nChess.nBoard import nBoard, Move
+from nChess.nBoard import Move
 from nChess.Piece import Piece
 from nChess.Piece.Bishop import Bishop
 from nChess.Piece.Knight import Knight
@@ -11,12 +11,27 @@ from nChess.Piece.Rook import Rook
 class Pawn(Piece):
     """Implements the Pawn piece and its generalization to higher dimensions."""
 
+    __slots__ = ("capture_axis",)
+
     promotions: tuple[Type["Piece"]] = (Bishop, Knight, Queen, Rook)
 
     def __init__(self, position, color, has_moved=False, board=None, capture_axis=0) -> None:
         super().__init__(position, color, has_moved, board)
         self.capture_axis = capture_axis
 
+    def __reduce__(self):
+        return type(self), (self.position, self.color, self.has_moved, None, self.capture_axis)
+
+    @staticmethod
+    def color_direction(color) -> int:
+        """Step along the forward axes of the pawns of color."""
+        from nChess.nBoard.Board import ClassicColor
+        return 1 if color is ClassicColor.white else -1
+
+    @property
+    def direction(self) -> int:
+        return self.color_direction(self.color)
+
     def is_promotable(self) -> bool:
         from nChess.nBoard.Board import ClassicColor
         return all(
@@ -24,30 +39,27 @@ class Pawn(Piece):
             for i in self.position[1::]
         )
 
-    def all_moves(self) -> tuple["Move", ...]:
-        from nChess.nBoard.Board import ClassicColor
+    def all_moves(self, captures: bool = True, quiets: bool = True) -> tuple["Move", ...]:
+        direction = self.direction
+
+        occupancy = self.board.occupancy
+        occupants = self.board.occupants
+        positions = self.board.tables.positions
+        index = self.board.flat_index(self.position)
+        move = self.board.tables.move
 
-        direction = 1 if self.color is ClassicColor.white else -1
-        
         moves = []
-        for i, base in enumerate(self.board.basis):
-            if i == self.capture_axis:
-                continue
-            unfiltered_move = Move(self.position, tuple(self.position[i] + base[i] * direction for i in range(self.board.dimension)))
-            if self.board.in_bounds(unfiltered_move.final_position) and not self.board.contains(unfiltered_move.final_position):
-                moves.append(unfiltered_move)
-                unfiltered_move = Move(self.position, tuple(self.position[i] + base[i] * direction * 2 for i in range(self.board.dimension)))
-                if self.board.in_bounds(unfiltered_move.final_position) and not self.board.contains(unfiltered_move.final_position):
-                    moves.append(unfiltered_move)
-
-        capture_moves = []
-        for i in (-1, 1):
-            for base in self.board.basis:
-                unfiltered_move = Move(self.position, tuple(
-                    self.position[j] + base[j] * direction + i * self.board.basis[self.capture_axis][j] for j in range(self.board.dimension)
-                    )
-                )
-                if not self.board.move_in_conflict(unfiltered_move) and self.board.contains(unfiltered_move.final_position):
-                    capture_moves.append(unfiltered_move)
+        if quiets:
+            for ray in self.board.tables.pawn_pushes(index, direction, self.capture_axis):
+                for target in ray:
+                    if occupancy[target]:
+                        break
+                    moves.append(move(index, target))
+
+        capture_moves = [
+            move(index, target)
+            for target in self.board.tables.pawn_captures(index, direction, self.capture_axis)
+            if occupancy[target] and occupants[positions[target]].color != self.color
+        ] if captures else []
 
         return tuple(moves + capture_moves)
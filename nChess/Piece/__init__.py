@@ -1,16 +1,24 @@
 from abc import ABC
 from dataclasses import dataclass
-from typing import Type
+from typing import Iterator, Type
 from abc import ABC
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Move:
     initial_position: "IntegerVector"
     final_position: "IntegerVector"
 
 
-@dataclass(frozen=True)
+def move_name(move: Move) -> str:
+    """The move as text, e.g. "4,1-4,3"."""
+    return "{}-{}".format(
+        ",".join(map(str, move.initial_position)),
+        ",".join(map(str, move.final_position))
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class PieceData:
     color: "Color"
     piece_type: Type["Piece"]
@@ -19,10 +27,13 @@ class PieceData:
 
 
 class Piece(ABC):
+    __slots__ = ("position", "color", "has_moved", "board", "piece_id")
+
     position: "IntegerVector"
     color: "Color"
     has_moved: bool
     board: "nBoard"
+    piece_id: int
 
     promotions: tuple[Type["Piece"]]
 
@@ -32,9 +43,15 @@ class Piece(ABC):
         self.color = color
         self.has_moved = has_moved
         self.board = board
+        self.piece_id = None
+
+    def __reduce__(self):
+        # Pickled without its board, which pickles its own pieces.
+        return type(self), (self.position, self.color, self.has_moved)
 
     def set_board(self, board):
         self.board = board
+        self.piece_id = None
 
     def move(self, move: "Move") -> None:
         assert self.position == move.initial_position
@@ -45,40 +62,92 @@ class Piece(ABC):
             self.color == piece_data.color
             and type(self) is piece_data.piece_type
             and (
-                piece_data.position is not None
-                and self.position == piece_data.position
+                piece_data.position is None
+                or self.position == piece_data.position
             )
             and (
-                piece_data.has_moved is not None
-                and self.has_moved == piece_data.has_moved
+                piece_data.has_moved is None
+                or self.has_moved == piece_data.has_moved
             )
         )
 
     def is_promotable(self) -> bool:
         raise NotImplementedError
 
-    def ad_nauseam(self, offsets: tuple["IntegerVector"], maximum_magnitude: int) -> tuple["Move", ...]:
+    def slide(self, rays: tuple[tuple[int, ...], ...], captures: bool = True, quiets: bool = True) -> list["Move"]:
+        occupancy = self.board.occupancy
+        occupants = self.board.occupants
+        positions = self.board.tables.positions
+        index = self.board.flat_index(self.position)
+        move = self.board.tables.move
         moves = []
-        for offset in offsets:
-            for magnitude in range(1, maximum_magnitude + 1):
-                move = Move(
-                    self.position, 
-                    tuple(self.position[i] + (offset[i] * magnitude) for i in range(self.board.dimension))
-                )
-                if not self.board.move_in_conflict(move):
-                    moves.append(move)
-                else:
+        for ray in rays:
+            for target in ray:
+                if occupancy[target]:
+                    if captures and occupants[positions[target]].color != self.color:
+                        moves.append(move(index, target))
                     break
+                if quiets:
+                    moves.append(move(index, target))
         return moves
 
-    def all_moves(self) -> tuple["Move", ...]:
+    def iter_slide(self, rays: tuple[tuple[int, ...], ...]) -> Iterator["Move"]:
+        """slide, one move at a time: later rays are not scanned until needed."""
+        occupancy = self.board.occupancy
+        occupants = self.board.occupants
+        positions = self.board.tables.positions
+        index = self.board.flat_index(self.position)
+        move = self.board.tables.move
+        for ray in rays:
+            for target in ray:
+                if occupancy[target]:
+                    if occupants[positions[target]].color != self.color:
+                        yield move(index, target)
+                    break
+                yield move(index, target)
+
+    def leap(self, targets: tuple[int, ...], captures: bool = True, quiets: bool = True) -> list["Move"]:
+        occupancy = self.board.occupancy
+        occupants = self.board.occupants
+        positions = self.board.tables.positions
+        index = self.board.flat_index(self.position)
+        move = self.board.tables.move
+        return [
+            move(index, target)
+            for target in targets
+            if (
+                quiets if not occupancy[target]
+                else captures and occupants[positions[target]].color != self.color
+            )
+        ]
+
+    def all_moves(self, captures: bool = True, quiets: bool = True) -> tuple["Move", ...]:
+        """Pseudo-legal moves; captures and quiets select which kinds are generated."""
         raise NotImplementedError
 
-    def legal_moves(self) -> tuple["Move", ...]:
+    def iter_moves(self) -> Iterator["Move"]:
+        """Pseudo-legal moves, generated lazily where the piece supports it."""
+        return iter(self.all_moves())
+
+    def iter_legal_moves(self, check_info: "CheckInfo" = None) -> Iterator["Move"]:
+        """Legal moves, each checked only when it is reached. The board must not
+        be changed while the iterator is in use."""
+        if check_info is None:
+            check_info = self.board.check_info(self.color)
+        moves = self.board.iter_pseudo_moves(self)
+        if not check_info.requires_verification(self):
+            return moves
+        return (move for move in moves if not self.board.leaves_in_check(move))
+
+    def legal_moves(self, check_info: "CheckInfo" = None) -> tuple["Move", ...]:
+        if check_info is None:
+            check_info = self.board.check_info(self.color)
+        if not check_info.requires_verification(self):
+            return tuple(self.board.pseudo_moves(self))
         return tuple(
             move
-            for move in self.all_moves()
-            if not self.board.assume_move(move).in_check(self.color)
+            for move in self.board.pseudo_moves(self)
+            if not self.board.leaves_in_check(move)
         )
 
     def moves(self) -> tuple["Move", ...]:
@@ -86,4 +155,4 @@ class Piece(ABC):
 
 
 # XXX
-from nChess.nBoard import nBoard, IntegerVector, Color
+from nChess.nBoard import nBoard, IntegerVector, Color, CheckInfo
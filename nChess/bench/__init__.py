@@ -0,0 +1,291 @@
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from typing import Iterator
+
+from nChess.nBoard import nBoard, Backend, Move
+from nChess.nBoard.Board import Board
+from nChess.nBoard.Hypercube import Hypercube
+from nChess.nBoard.Tesseract import Tesseract
+from nChess.Piece import move_name
+
+
+@dataclass
+class Phases:
+    """Seconds spent in each phase of move generation during a perft run."""
+
+    generation: float = 0
+    legality: float = 0
+    make_unmake: float = 0
+
+
+@dataclass
+class WorkerStats:
+    """Work done by one worker process during a parallel perft run."""
+
+    tasks: int = 0
+    nodes: int = 0
+    seconds: float = 0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0
+
+
+@dataclass
+class PerftResult:
+    position: str
+    backend: str
+    depth: int
+    nodes: int
+    seconds: float
+    nodes_per_second: float
+    phases: Phases = None
+    peak_memory: int = None
+    divide: dict[str, int] = field(default_factory=dict)
+    workers: int = 1
+    worker_throughput: list[dict] = field(default_factory=list)
+
+
+def legal_moves(board: nBoard, phases: Phases = None) -> list[Move]:
+    color = board.current_turn()
+    if phases is None:
+        return list(board.legal_moves(color))
+
+    clock = time.perf_counter
+    moves = []
+
+    start = clock()
+    check_info = board.check_info(color)
+    phases.legality += clock() - start
+
+    if board.backend is Backend.bitboard and check_info.check_mask is not None:
+        # The check and pin masks filter the moves as they are generated.
+        start = clock()
+        moves = board.bitboards.legal_moves(color, check_info)
+        phases.generation += clock() - start
+        return moves
+
+    for piece in tuple(board.pieces):
+        if piece.color != color:
+            continue
+
+        start = clock()
+        pseudo_moves = board.pseudo_moves(piece)
+        middle = clock()
+        if check_info.requires_verification(piece):
+            pseudo_moves = [move for move in pseudo_moves if not board.leaves_in_check(move)]
+        phases.generation += middle - start
+        phases.legality += clock() - middle
+
+        moves.extend(pseudo_moves)
+
+    return moves
+
+
+def perft(board: nBoard, depth: int, phases: Phases = None) -> int:
+    """Counts the leaf nodes of the legal move tree of board, depth plies deep."""
+    if depth == 0:
+        return 1
+
+    moves = legal_moves(board, phases)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    if phases is None:
+        for move in moves:
+            record = board.make_move(move)
+            nodes += perft(board, depth - 1)
+            board.unmake_move(record)
+        return nodes
+
+    clock = time.perf_counter
+    for move in moves:
+        start = clock()
+        record = board.make_move(move)
+        phases.make_unmake += clock() - start
+        nodes += perft(board, depth - 1, phases)
+        start = clock()
+        board.unmake_move(record)
+        phases.make_unmake += clock() - start
+    return nodes
+
+
+def divide(board: nBoard, depth: int, phases: Phases = None) -> dict[Move, int]:
+    """Perft split by root move."""
+    assert depth >= 1
+
+    nodes = {}
+    for move in legal_moves(board, phases):
+        record = board.make_move(move)
+        nodes[move] = perft(board, depth - 1, phases)
+        board.unmake_move(record)
+    return nodes
+
+
+def split(board: nBoard, depth: int, path: tuple[Move, ...] = ()) -> Iterator[tuple[Move, ...]]:
+    """Move paths from board to every node of its legal move tree depth plies deep."""
+    if depth == 0:
+        yield path
+        return
+
+    for move in legal_moves(board):
+        record = board.make_move(move)
+        yield from split(board, depth - 1, path + (move,))
+        board.unmake_move(record)
+
+
+def perft_paths(board: nBoard, paths: list[tuple[Move, ...]], depth: int) -> tuple[int, list[int], float]:
+    """Worker task: perft depth plies deep below the end of each path.
+
+    Returns the worker's process id, the node count of each path and the
+    seconds spent.
+    """
+    start = time.perf_counter()
+    nodes = []
+    for path in paths:
+        records = [board.make_move(move) for move in path]
+        nodes.append(perft(board, depth))
+        for record in reversed(records):
+            board.unmake_move(record)
+    return os.getpid(), nodes, time.perf_counter() - start
+
+
+def parallel_divide(
+    board: nBoard,
+    depth: int,
+    workers: int = None,
+    split_depth: int = 1,
+    chunk_size: int = 1
+) -> tuple[dict[Move, int], dict[int, WorkerStats]]:
+    """divide() over a process pool, with the per-worker statistics by process id.
+
+    The tree is expanded split_depth plies deep in this process; the subtrees
+    below are sent to the pool chunk_size at a time. Idle workers take the next
+    chunk from the shared queue, so small chunks balance uneven subtrees.
+    """
+    assert depth >= 1
+    split_depth = max(1, min(split_depth, depth))
+
+    nodes = {move: 0 for move in legal_moves(board)}
+    paths = list(split(board, split_depth))
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    stats = {}
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {pool.submit(perft_paths, board, chunk, depth - split_depth): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            pid, counts, seconds = future.result()
+            for path, count in zip(futures[future], counts):
+                nodes[path[0]] += count
+
+            worker = stats.setdefault(pid, WorkerStats())
+            worker.tasks += 1
+            worker.nodes += sum(counts)
+            worker.seconds += seconds
+
+    return nodes, stats
+
+
+def position(name: str, backend: Backend = Backend.object) -> nBoard:
+    """Builds a named start position: classic, tesseract or hypercube:<dimension>:<side>."""
+    if name == "classic":
+        return Board(backend)
+    if name == "tesseract":
+        return Tesseract(backend)
+    if name.startswith("hypercube:"):
+        _, dimension, side = name.split(":")
+        return Hypercube(int(dimension), int(side), backend)
+    raise ValueError(f"unknown position {name!r}")
+
+
+def run(
+    name: str,
+    depth: int,
+    backend: Backend = Backend.object,
+    split: bool = False,
+    phases: bool = True,
+    memory: bool = False,
+    workers: int = 1,
+    split_depth: int = 1,
+    chunk_size: int = 1
+) -> PerftResult:
+    """Perft of a named position; with more than one worker, over a process
+    pool (without phase timings, and tracing the memory of this process only)."""
+    board = position(name, backend)
+    timings = Phases() if phases and workers == 1 else None
+    stats = {}
+
+    if memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    if workers != 1 and depth >= 1:
+        nodes_by_move, stats = parallel_divide(board, depth, workers, split_depth, chunk_size)
+        nodes = sum(nodes_by_move.values())
+        if not split:
+            nodes_by_move = {}
+    elif split:
+        nodes_by_move = divide(board, depth, timings)
+        nodes = sum(nodes_by_move.values())
+    else:
+        nodes_by_move = {}
+        nodes = perft(board, depth, timings)
+    seconds = time.perf_counter() - start
+
+    peak_memory = None
+    if memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return PerftResult(
+        name,
+        backend.name,
+        depth,
+        nodes,
+        seconds,
+        nodes / seconds if seconds else 0,
+        timings,
+        peak_memory,
+        {move_name(move): count for move, count in nodes_by_move.items()},
+        workers,
+        [
+            {"pid": pid, **asdict(worker), "nodes_per_second": worker.nodes_per_second}
+            for pid, worker in sorted(stats.items())
+        ]
+    )
+
+
+def report(results: list[PerftResult]) -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "results": [asdict(result) for result in results]
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.1) -> list[str]:
+    """Regressions of current against baseline: node count mismatches and
+    nodes/sec drops larger than tolerance."""
+    key = lambda result: (result["position"], result["backend"], result["depth"])
+    baseline_results = {key(result): result for result in baseline["results"]}
+
+    regressions = []
+    for result in current["results"]:
+        reference = baseline_results.get(key(result))
+        if reference is None:
+            continue
+        if result["nodes"] != reference["nodes"]:
+            regressions.append(
+                "{} {} depth {}: {} nodes, expected {}".format(*key(result), result["nodes"], reference["nodes"])
+            )
+        elif result["nodes_per_second"] < reference["nodes_per_second"] * (1 - tolerance):
+            regressions.append(
+                "{} {} depth {}: {:.0f} nodes/s, baseline {:.0f}".format(
+                    *key(result), result["nodes_per_second"], reference["nodes_per_second"]
+                )
+            )
+    return regressions
@@ -0,0 +1,74 @@
+import json
+import sys
+from argparse import ArgumentParser
+
+from nChess.nBoard import Backend
+from nChess.bench import run, report, compare
+
+
+def main():
+    parser = ArgumentParser(prog="python -m nChess.bench", description="Perft benchmark across board geometries.")
+    parser.add_argument(
+        "positions", nargs="*", default=["classic", "tesseract"],
+        help="classic, tesseract or hypercube:<dimension>:<side> (default: classic tesseract)"
+    )
+    parser.add_argument("-d", "--depth", type=int, default=3)
+    parser.add_argument("-b", "--backend", choices=[backend.name for backend in Backend], action="append")
+    parser.add_argument("--divide", action="store_true", help="report node counts per root move")
+    parser.add_argument("--no-phases", action="store_true", help="skip per-phase timing")
+    parser.add_argument("--memory", action="store_true", help="trace peak memory (slows the run down)")
+    parser.add_argument("-o", "--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against; exits with 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed nodes/sec drop against the baseline")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes, 0 for one per core (default: 1)")
+    parser.add_argument("--split-depth", type=int, default=1, help="plies expanded before handing subtrees to the workers")
+    parser.add_argument("--chunk-size", type=int, default=1, help="subtrees per worker task")
+    arguments = parser.parse_args()
+
+    results = []
+    for name in arguments.positions:
+        for backend in arguments.backend or [Backend.object.name]:
+            result = run(
+                name,
+                arguments.depth,
+                Backend[backend],
+                split=arguments.divide,
+                phases=not arguments.no_phases,
+                memory=arguments.memory,
+                workers=arguments.workers or None,
+                split_depth=arguments.split_depth,
+                chunk_size=arguments.chunk_size
+            )
+            print(
+                f"{result.position} [{result.backend}] depth {result.depth}: "
+                f"{result.nodes} nodes in {result.seconds:.3f}s ({result.nodes_per_second:.0f} nodes/s)",
+                file=sys.stderr
+            )
+            for worker in result.worker_throughput:
+                print(
+                    f"  worker {worker['pid']}: {worker['tasks']} tasks, {worker['nodes']} nodes "
+                    f"in {worker['seconds']:.3f}s ({worker['nodes_per_second']:.0f} nodes/s)",
+                    file=sys.stderr
+                )
+            results.append(result)
+
+    output = report(results)
+    text = json.dumps(output, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = compare(output, json.load(file), arguments.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+# Worker processes may import this module again; only the parent runs the CLI.
+if __name__ == "__main__":
+    main()
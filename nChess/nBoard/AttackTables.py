@@ -0,0 +1,344 @@
+from functools import lru_cache
+from typing import Callable
+
+from nChess.nBoard import IntegerVector, Move
+from nChess.nBoard.Geometry import Geometry, geometry
+
+Ray = tuple[int, ...]
+
+# Entries kept per square for the slider attacks of each occupancy, and for the
+# moves of each target mask; past that, results are computed but not stored.
+CACHE_ENTRIES = 1 << 12
+
+
+class AttackTables:
+    """Per-square target tables for a board geometry, indexed by flat square index.
+
+    Tables are filled lazily, one square at a time, so large boards only pay for
+    the squares that are actually probed.
+    """
+
+    geometry: Geometry
+    dimension: int
+    size: IntegerVector
+    strides: IntegerVector
+    positions: tuple[IntegerVector, ...]
+    indices: dict[IntegerVector, int]
+
+    cardinals: tuple[IntegerVector, ...]
+    diagonals: tuple[IntegerVector, ...]
+    L: tuple[IntegerVector, ...]
+
+    def __init__(self, dimension: int, size: IntegerVector):
+        shape = self.geometry = geometry(dimension, size)
+        self.dimension = dimension
+        self.size = size
+        self.strides = shape.strides
+        self.positions = shape.positions
+        self.indices = shape.indices
+
+        self.cardinals = shape.cardinals
+        self.diagonals = shape.diagonals
+        self.L = shape.L
+
+        cells = len(self.positions)
+        self._cardinal_rays = [None] * cells
+        self._diagonal_rays = [None] * cells
+        self._king_targets = [None] * cells
+        self._knight_targets = [None] * cells
+        self._pawn_pushes = {}
+        self._pawn_captures = {}
+
+        self._cardinal_ray_masks = [None] * cells
+        self._diagonal_ray_masks = [None] * cells
+        self._king_masks = [None] * cells
+        self._knight_masks = [None] * cells
+        self._pawn_capture_masks = {}
+        self._cardinal_attacks = [None] * cells
+        self._diagonal_attacks = [None] * cells
+        self._knight_attacks = [None] * cells
+        self._pawn_targets = {}
+
+        self._moves = [None] * cells
+        self._target_moves = [None] * cells
+
+    def ray(self, index: int, offset: IntegerVector, maximum_magnitude: int = None) -> Ray:
+        if maximum_magnitude is None:
+            maximum_magnitude = max(self.size) - 1
+
+        position = self.positions[index]
+        ray = []
+        for magnitude in range(1, maximum_magnitude + 1):
+            target = tuple(position[i] + offset[i] * magnitude for i in range(self.dimension))
+            if not self.geometry.in_bounds(target):
+                break
+            ray.append(self.geometry.flat_index(target))
+        return tuple(ray)
+
+    def cardinal_rays(self, index: int) -> tuple[Ray, ...]:
+        rays = self._cardinal_rays[index]
+        if rays is None:
+            rays = self._cardinal_rays[index] = tuple(self.ray(index, offset) for offset in self.cardinals)
+        return rays
+
+    def diagonal_rays(self, index: int) -> tuple[Ray, ...]:
+        rays = self._diagonal_rays[index]
+        if rays is None:
+            rays = self._diagonal_rays[index] = tuple(self.ray(index, offset) for offset in self.diagonals)
+        return rays
+
+    def king_targets(self, index: int) -> tuple[int, ...]:
+        targets = self._king_targets[index]
+        if targets is None:
+            targets = self._king_targets[index] = tuple(
+                ray[0]
+                for ray in (self.ray(index, offset, 1) for offset in self.cardinals + self.diagonals)
+                if ray
+            )
+        return targets
+
+    def knight_targets(self, index: int) -> tuple[tuple[int, Ray], ...]:
+        """Knight targets paired with the squares of the rectangle the jump spans,
+        endpoints excluded."""
+        targets = self._knight_targets[index]
+        if targets is None:
+            position = self.positions[index]
+            targets = []
+            for offset in self.L:
+                target = tuple(position[i] + offset[i] for i in range(self.dimension))
+                if not self.geometry.in_bounds(target):
+                    continue
+                x_axis, y_axis = (axis for axis, j in enumerate(offset) if j)
+                x_direction = 1 if offset[x_axis] > 0 else -1
+                y_direction = 1 if offset[y_axis] > 0 else -1
+                partial_indices = []
+                for i in range(0, offset[x_axis] + x_direction, x_direction):
+                    for j in range(0, offset[y_axis] + y_direction, y_direction):
+                        if (i == 0 and j == 0) or (i == offset[x_axis] and j == offset[y_axis]):
+                            continue
+                        partial_indices.append(
+                            index + i * self.strides[x_axis] + j * self.strides[y_axis]
+                        )
+                targets.append((self.geometry.flat_index(target), tuple(partial_indices)))
+            targets = self._knight_targets[index] = tuple(targets)
+        return targets
+
+    def pawn_pushes(self, index: int, direction: int, capture_axis: int) -> tuple[Ray, ...]:
+        """One ray per forward axis, holding the single and (if in bounds) double push."""
+        key = (index, direction, capture_axis)
+        rays = self._pawn_pushes.get(key)
+        if rays is None:
+            rays = self._pawn_pushes[key] = tuple(
+                ray
+                for axis in range(self.dimension)
+                if axis != capture_axis
+                for ray in (self.ray(index, self.unit(axis, direction), 2),)
+                if ray
+            )
+        return rays
+
+    def pawn_captures(self, index: int, direction: int, capture_axis: int) -> tuple[int, ...]:
+        key = (index, direction, capture_axis)
+        targets = self._pawn_captures.get(key)
+        if targets is None:
+            position = self.positions[index]
+            targets = []
+            for side in (-1, 1):
+                for axis in range(self.dimension):
+                    if axis == capture_axis:
+                        continue
+                    target = tuple(
+                        position[i] + (direction if i == axis else side if i == capture_axis else 0)
+                        for i in range(self.dimension)
+                    )
+                    if self.geometry.in_bounds(target):
+                        targets.append(self.geometry.flat_index(target))
+            targets = self._pawn_captures[key] = tuple(targets)
+        return targets
+
+    @staticmethod
+    def mask(indices: tuple[int, ...]) -> int:
+        mask = 0
+        for index in indices:
+            mask |= 1 << index
+        return mask
+
+    def ray_masks(self, index: int, rays: tuple[Ray, ...]) -> tuple[tuple[int, bool], ...]:
+        """Bit masks of rays, each paired with whether the ray runs towards higher indices."""
+        return tuple((self.mask(ray), bool(ray) and ray[0] > index) for ray in rays)
+
+    def cardinal_ray_masks(self, index: int) -> tuple[tuple[int, bool], ...]:
+        masks = self._cardinal_ray_masks[index]
+        if masks is None:
+            masks = self._cardinal_ray_masks[index] = self.ray_masks(index, self.cardinal_rays(index))
+        return masks
+
+    def diagonal_ray_masks(self, index: int) -> tuple[tuple[int, bool], ...]:
+        masks = self._diagonal_ray_masks[index]
+        if masks is None:
+            masks = self._diagonal_ray_masks[index] = self.ray_masks(index, self.diagonal_rays(index))
+        return masks
+
+    @staticmethod
+    def slide(index: int, ray_masks: Callable[[int], tuple[tuple[int, bool], ...]], occupied: int) -> int:
+        """Squares reached along the rays of index, up to and including the first
+        occupied square of each ray."""
+        attacks = 0
+        for k, (mask, ascending) in enumerate(ray_masks(index)):
+            blockers = mask & occupied
+            if blockers:
+                if ascending:
+                    first = (blockers & -blockers).bit_length() - 1
+                else:
+                    first = blockers.bit_length() - 1
+                mask ^= ray_masks(first)[k][0]
+            attacks |= mask
+        return attacks
+
+    def slide_table(self, rays: tuple[Ray, ...]) -> tuple[int, dict[int, int]]:
+        """The squares of rays whose occupancy can stop a slide, the last square
+        of each ray excepted, and an empty table of attacks by occupancy."""
+        return self.mask(tuple(target for ray in rays for target in ray[:-1])), {}
+
+    def cardinal_attacks(self, index: int, occupied: int) -> int:
+        """slide along the cardinal rays, looked up by the occupancy of the rays."""
+        table = self._cardinal_attacks[index]
+        if table is None:
+            table = self._cardinal_attacks[index] = self.slide_table(self.cardinal_rays(index))
+        relevant, attacks_by_blockers = table
+        blockers = occupied & relevant
+        attacks = attacks_by_blockers.get(blockers)
+        if attacks is None:
+            attacks = self.slide(index, self.cardinal_ray_masks, blockers)
+            if len(attacks_by_blockers) < CACHE_ENTRIES:
+                attacks_by_blockers[blockers] = attacks
+        return attacks
+
+    def diagonal_attacks(self, index: int, occupied: int) -> int:
+        """slide along the diagonal rays, looked up by the occupancy of the rays."""
+        table = self._diagonal_attacks[index]
+        if table is None:
+            table = self._diagonal_attacks[index] = self.slide_table(self.diagonal_rays(index))
+        relevant, attacks_by_blockers = table
+        blockers = occupied & relevant
+        attacks = attacks_by_blockers.get(blockers)
+        if attacks is None:
+            attacks = self.slide(index, self.diagonal_ray_masks, blockers)
+            if len(attacks_by_blockers) < CACHE_ENTRIES:
+                attacks_by_blockers[blockers] = attacks
+        return attacks
+
+    def king_mask(self, index: int) -> int:
+        mask = self._king_masks[index]
+        if mask is None:
+            mask = self._king_masks[index] = self.mask(self.king_targets(index))
+        return mask
+
+    def knight_masks(self, index: int) -> tuple[tuple[int, int], ...]:
+        """Knight targets paired with the mask of the squares the jump spans."""
+        masks = self._knight_masks[index]
+        if masks is None:
+            masks = self._knight_masks[index] = tuple(
+                (target, self.mask(partial_indices))
+                for target, partial_indices in self.knight_targets(index)
+            )
+        return masks
+
+    def pawn_capture_mask(self, index: int, direction: int, capture_axis: int) -> int:
+        key = (index, direction, capture_axis)
+        mask = self._pawn_capture_masks.get(key)
+        if mask is None:
+            mask = self._pawn_capture_masks[key] = self.mask(self.pawn_captures(index, direction, capture_axis))
+        return mask
+
+    def moves_from(self, index: int) -> dict[int, "Move"]:
+        """Shared Move objects from index, keyed by target index and created on demand."""
+        moves = self._moves[index]
+        if moves is None:
+            moves = self._moves[index] = {}
+        return moves
+
+    def move(self, index: int, target: int) -> "Move":
+        moves = self.moves_from(index)
+        move = moves.get(target)
+        if move is None:
+            move = moves[target] = Move(self.positions[index], self.positions[target])
+        return move
+
+    def knight_attacks(self, index: int, occupied: int) -> int:
+        """Knight targets of index, a jump being blocked by three or more
+        occupied squares of its rectangle, looked up by their occupancy."""
+        table = self._knight_attacks[index]
+        if table is None:
+            relevant = 0
+            for _, partial_mask in self.knight_masks(index):
+                relevant |= partial_mask
+            table = self._knight_attacks[index] = (relevant, {})
+        relevant, attacks_by_blockers = table
+        blockers = occupied & relevant
+        attacks = attacks_by_blockers.get(blockers)
+        if attacks is None:
+            attacks = 0
+            for target, partial_mask in self.knight_masks(index):
+                if (blockers & partial_mask).bit_count() < 3:
+                    attacks |= 1 << target
+            if len(attacks_by_blockers) < CACHE_ENTRIES:
+                attacks_by_blockers[blockers] = attacks
+        return attacks
+
+    def pawn_targets(self, index: int, direction: int, capture_axis: int, occupied: int) -> int:
+        """Captures onto occupied squares and pushes up to the first occupied
+        square of each forward axis, looked up by the occupancy of both."""
+        key = (index, direction, capture_axis)
+        table = self._pawn_targets.get(key)
+        if table is None:
+            pushes = self.pawn_pushes(index, direction, capture_axis)
+            relevant = self.pawn_capture_mask(index, direction, capture_axis) | self.mask(sum(pushes, ()))
+            table = self._pawn_targets[key] = (relevant, {})
+        relevant, targets_by_blockers = table
+        blockers = occupied & relevant
+        targets = targets_by_blockers.get(blockers)
+        if targets is None:
+            targets = self.pawn_capture_mask(index, direction, capture_axis) & blockers
+            for ray in self.pawn_pushes(index, direction, capture_axis):
+                for target in ray:
+                    bit = 1 << target
+                    if blockers & bit:
+                        break
+                    targets |= bit
+            if len(targets_by_blockers) < CACHE_ENTRIES:
+                targets_by_blockers[blockers] = targets
+        return targets
+
+    def target_moves(self, index: int, targets: int) -> tuple["Move", ...]:
+        """The moves from index to the squares of the target mask targets."""
+        moves_by_targets = self._target_moves[index]
+        if moves_by_targets is None:
+            moves_by_targets = self._target_moves[index] = {}
+        moves = moves_by_targets.get(targets)
+        if moves is None:
+            moves = []
+            remaining = targets
+            while remaining:
+                bit = remaining & -remaining
+                moves.append(self.move(index, bit.bit_length() - 1))
+                remaining ^= bit
+            moves = tuple(moves)
+            if len(moves_by_targets) < CACHE_ENTRIES:
+                moves_by_targets[targets] = moves
+        return moves
+
+    def pack(self, move: "Move") -> int:
+        """move as the int from_index * cells + to_index."""
+        return self.indices[move.initial_position] * len(self.positions) + self.indices[move.final_position]
+
+    def unpack(self, packed_move: int) -> "Move":
+        return self.move(*divmod(packed_move, len(self.positions)))
+
+    def unit(self, axis: int, magnitude: int = 1) -> IntegerVector:
+        return tuple(magnitude if i == axis else 0 for i in range(self.dimension))
+
+
+@lru_cache(maxsize=None)
+def attack_tables(dimension: int, size: IntegerVector) -> AttackTables:
+    return AttackTables(dimension, size)
@@ -0,0 +1,378 @@
+from typing import Callable, Type
+
+from nChess.nBoard import nBoard, Color, Move, CheckInfo
+from nChess.nBoard.AttackTables import AttackTables
+from nChess.Piece import Piece
+from nChess.Piece.Bishop import Bishop
+from nChess.Piece.King import King
+from nChess.Piece.Knight import Knight
+from nChess.Piece.Pawn import Pawn
+from nChess.Piece.Queen import Queen
+from nChess.Piece.Rook import Rook
+
+
+class Bitboards:
+    """Occupancy of an nBoard as integer bitboards, bit i standing for flat square i.
+
+    Keeps one bitboard per (color, piece type), one per color, one per piece
+    type, one per pawn (direction, capture_axis) and the overall occupancy, and generates moves and
+    attacks from them with the ray masks of AttackTables. Legality comes from the check
+    and pin masks of check_info, with make/unmake only for the moves they cannot decide.
+    """
+
+    board: nBoard
+    tables: AttackTables
+
+    occupied: int
+    boards: list[int]
+    colors: dict[Color, int]
+    pieces: dict[tuple[Color, Type[Piece]], int]
+    types: dict[Type[Piece], int]
+    pawns: dict[tuple[int, int], int]
+    slots: dict[Piece, tuple[int, ...]]
+    pawn_keys: dict[Pawn, tuple[int, int]]
+
+    def __init__(self, board: nBoard):
+        self.board = board
+        self.tables = board.tables
+
+        # Bitboards live in self.boards; colors, pieces, types and pawns map their keys
+        # to slots in it, and slots caches the slots each piece is counted in.
+        self.occupied = 0
+        self.boards = []
+        self.colors = {}
+        self.pieces = {}
+        self.types = {}
+        self.pawns = {}
+        self.slots = {}
+        self.pawn_keys = {}
+        self.full = (1 << len(board.occupancy)) - 1
+
+    def slot(self, slots: dict, key) -> int:
+        if key not in slots:
+            slots[key] = len(self.boards)
+            self.boards.append(0)
+        return slots[key]
+
+    def piece_slots(self, piece: Piece) -> tuple[int, ...]:
+        slots = self.slots.get(piece)
+        if slots is None:
+            slots = (
+                self.slot(self.colors, piece.color),
+                self.slot(self.pieces, (piece.color, type(piece))),
+                self.slot(self.types, type(piece))
+            )
+            if isinstance(piece, Pawn):
+                self.pawn_keys[piece] = key = (piece.direction, piece.capture_axis)
+                slots += (self.slot(self.pawns, key),)
+            self.slots[piece] = slots
+        return slots
+
+    def get(self, slots: dict, key) -> int:
+        slot = slots.get(key)
+        return 0 if slot is None else self.boards[slot]
+
+    def occupy(self, piece: Piece, index: int):
+        bit = 1 << index
+        self.occupied |= bit
+        boards = self.boards
+        for slot in self.piece_slots(piece):
+            boards[slot] |= bit
+
+    def vacate(self, piece: Piece, index: int):
+        bit = ~(1 << index)
+        self.occupied &= bit
+        boards = self.boards
+        for slot in self.piece_slots(piece):
+            boards[slot] &= bit
+
+    def attacks_from(self, piece_type: Type[Piece], index: int, occupied: int) -> int:
+        """The squares a piece of piece_type, other than a pawn, on index reaches."""
+        # Dispatch on the exact type: isinstance through the Piece ABC costs
+        # more than generating the moves of a leaper.
+        if piece_type is Queen:
+            return self.tables.cardinal_attacks(index, occupied) | self.tables.diagonal_attacks(index, occupied)
+        if piece_type is Rook:
+            return self.tables.cardinal_attacks(index, occupied)
+        if piece_type is Bishop:
+            return self.tables.diagonal_attacks(index, occupied)
+        if piece_type is King:
+            return self.tables.king_mask(index)
+        if piece_type is Knight:
+            return self.tables.knight_attacks(index, occupied)
+        raise NotImplementedError
+
+    def targets(self, piece: Piece, index: int, captures: bool = True, quiets: bool = True) -> int:
+        own = self.boards[self.piece_slots(piece)[0]]
+        occupied = self.occupied
+
+        if type(piece) is Pawn:
+            attacks = self.tables.pawn_targets(index, *self.pawn_keys[piece], occupied)
+        else:
+            attacks = self.attacks_from(type(piece), index, occupied)
+
+        attacks &= ~own
+        if not captures:
+            attacks &= ~occupied
+        if not quiets:
+            attacks &= occupied
+        return attacks
+
+    def moves(self, piece: Piece, captures: bool = True, quiets: bool = True) -> list[Move]:
+        if type(piece) not in GENERATED:
+            return list(piece.all_moves(captures, quiets))
+
+        index = self.board.flat_index(piece.position)
+        return list(self.tables.target_moves(index, self.targets(piece, index, captures, quiets)))
+
+    def attackers(self, index: int, candidates: int, occupied: int) -> int:
+        """The squares of candidates holding a piece that attacks index, with the
+        board occupied as occupied."""
+        types = self.types
+        boards = self.boards
+        attackers = 0
+
+        queens = self.get(types, Queen)
+        rooks = (self.get(types, Rook) | queens) & candidates
+        if rooks:
+            attackers |= self.tables.cardinal_attacks(index, occupied) & rooks
+        bishops = (self.get(types, Bishop) | queens) & candidates
+        if bishops:
+            attackers |= self.tables.diagonal_attacks(index, occupied) & bishops
+        attackers |= self.tables.king_mask(index) & self.get(types, King) & candidates
+
+        knights = self.get(types, Knight) & candidates
+        if knights:
+            for source, partial_mask in self.tables.knight_masks(index):
+                if knights >> source & 1 and (occupied & partial_mask).bit_count() < 3:
+                    attackers |= 1 << source
+
+        pawns = self.get(types, Pawn) & candidates
+        if pawns:
+            for (direction, capture_axis), slot in self.pawns.items():
+                attackers |= boards[slot] & pawns & self.tables.pawn_capture_mask(index, -direction, capture_axis)
+
+        return attackers
+
+    def is_attacked(self, index: int, is_attacker: Callable[[Color], bool]) -> bool:
+        candidates = 0
+        for color, slot in self.colors.items():
+            if is_attacker(color):
+                candidates |= self.boards[slot]
+        return bool(candidates and self.attackers(index, candidates, self.occupied))
+
+    def in_check(self, color: Color) -> bool:
+        kings = self.get(self.pieces, (color, King))
+        while kings:
+            bit = kings & -kings
+            if self.is_attacked(bit.bit_length() - 1, lambda attacker_color: attacker_color != color):
+                return True
+            kings ^= bit
+        return False
+
+    def piece_at(self, index: int) -> Piece:
+        return self.board.occupants[self.tables.positions[index]]
+
+    def check_info(self, color: Color) -> CheckInfo:
+        """CheckInfo of the single king of color, with the check mask and the pin
+        rays that decide the legality of most moves without making them; None
+        if color does not have exactly one king."""
+        kings = self.get(self.pieces, (color, King))
+        if kings.bit_count() != 1:
+            return None
+        king = kings.bit_length() - 1
+        occupied = self.occupied
+        own = self.get(self.colors, color)
+        enemies = occupied & ~own
+        queens = self.get(self.types, Queen)
+
+        # An own piece is pinned when it is the first piece along a ray from the
+        # king and an enemy slider of the ray's kind the second; it may only
+        # move between the king and the slider, or capture it.
+        pin_masks = {}
+        for ray_masks, slider in ((self.tables.cardinal_ray_masks, Rook), (self.tables.diagonal_ray_masks, Bishop)):
+            sliders = (self.get(self.types, slider) | queens) & enemies
+            if not sliders:
+                continue
+            for k, (mask, ascending) in enumerate(ray_masks(king)):
+                blockers = mask & occupied
+                if not blockers & sliders:
+                    continue
+                first = lowest(blockers) if ascending else highest(blockers)
+                if not own >> first & 1:
+                    continue
+                blockers ^= 1 << first
+                second = lowest(blockers) if ascending else highest(blockers)
+                if sliders >> second & 1:
+                    pin_masks[first] = mask ^ ray_masks(second)[k][0]
+
+        # Knights jump only over fewer than three pieces: own pieces among
+        # exactly three blockers of an enemy knight are pinned too, and their
+        # moves are verified by making them.
+        knights = self.get(self.types, Knight) & enemies
+        if knights:
+            for source, partial_mask in self.tables.knight_masks(king):
+                if knights >> source & 1 and (occupied & partial_mask).bit_count() == 3:
+                    shields = occupied & partial_mask & own
+                    while shields:
+                        bit = shields & -shields
+                        pin_masks[bit.bit_length() - 1] = None
+                        shields ^= bit
+        pinned = frozenset(self.piece_at(index) for index in pin_masks)
+
+        # Other moves must capture a single checker or block its ray. Knight
+        # checks can also be blocked next to the knight and double checks
+        # sometimes by one move, so those leave check_mask None and every move
+        # is verified.
+        checkers = self.attackers(king, enemies, occupied)
+        check_mask = self.full
+        if checkers:
+            check_mask = None
+            checker = checkers.bit_length() - 1
+            if checkers.bit_count() == 1 and not checkers & knights:
+                check_mask = checkers
+                if type(self.piece_at(checker)) in (Queen, Rook, Bishop):
+                    for ray_masks in (self.tables.cardinal_ray_masks, self.tables.diagonal_ray_masks):
+                        for k, (mask, _) in enumerate(ray_masks(king)):
+                            if mask & checkers:
+                                check_mask = mask ^ ray_masks(checker)[k][0]
+
+        checking_pieces = []
+        while checkers:
+            bit = checkers & -checkers
+            checking_pieces.append(self.piece_at(bit.bit_length() - 1))
+            checkers ^= bit
+
+        return CheckInfo(color, tuple(checking_pieces), pinned, check_mask, pin_masks)
+
+    def king_move_is_safe(self, king: Piece, index: int, target: int) -> bool:
+        """Whether king, on index, may step to target without landing in check."""
+        enemies = self.occupied & ~self.boards[self.piece_slots(king)[0]] & ~(1 << target)
+        return not self.attackers(target, enemies, self.occupied & ~(1 << index))
+
+    def attacked_squares(self, candidates: int, occupied: int) -> int:
+        """The squares the pieces on candidates attack, with the board occupied as
+        occupied."""
+        tables = self.tables
+        types = self.types
+        attacked = 0
+
+        queens = self.get(types, Queen)
+        for sliders, attacks in (
+            ((self.get(types, Rook) | queens) & candidates, tables.cardinal_attacks),
+            ((self.get(types, Bishop) | queens) & candidates, tables.diagonal_attacks)
+        ):
+            while sliders:
+                bit = sliders & -sliders
+                attacked |= attacks(bit.bit_length() - 1, occupied)
+                sliders ^= bit
+
+        leapers = (self.get(types, King) | self.get(types, Knight)) & candidates
+        knights = self.get(types, Knight)
+        while leapers:
+            bit = leapers & -leapers
+            source = bit.bit_length() - 1
+            attacked |= tables.knight_attacks(source, occupied) if knights & bit else tables.king_mask(source)
+            leapers ^= bit
+
+        for (direction, capture_axis), slot in self.pawns.items():
+            pawns = self.boards[slot] & candidates
+            while pawns:
+                bit = pawns & -pawns
+                attacked |= tables.pawn_capture_mask(bit.bit_length() - 1, direction, capture_axis)
+                pawns ^= bit
+
+        return attacked
+
+    @staticmethod
+    def allowed(index: int, check_info: CheckInfo) -> int:
+        """The squares the pseudo-legal moves of the piece on index, not a king,
+        may land on; None if its moves must be verified by making them."""
+        pin_masks = check_info.pin_masks
+        if index in pin_masks:
+            pin_mask = pin_masks[index]
+            return None if pin_mask is None else pin_mask & check_info.check_mask
+        return check_info.check_mask
+
+    def is_legal(self, piece: Piece, index: int, target: int, check_info: CheckInfo) -> bool:
+        """Whether the pseudo-legal move of piece from index to target is legal;
+        None if it must be verified by making it."""
+        if type(piece) is King:
+            return self.king_move_is_safe(piece, index, target)
+        allowed = self.allowed(index, check_info)
+        return None if allowed is None else bool(allowed >> target & 1)
+
+    def legal_moves(self, color: Color, check_info: CheckInfo) -> list[Move]:
+        """The legal moves of color, check_info being the masked CheckInfo of
+        color, generated piece type by piece type from the bitboards."""
+        board = self.board
+        tables = self.tables
+        boards = self.boards
+        occupied = self.occupied
+        own = self.get(self.colors, color)
+        not_own = ~own
+        check_mask = check_info.check_mask
+        pin_masks = check_info.pin_masks
+        moves = []
+
+        def add_pinned(index: int, targets: int):
+            pin_mask = pin_masks[index]
+            if pin_mask is None:
+                moves.extend(move for move in tables.target_moves(index, targets) if not board.leaves_in_check(move))
+            else:
+                moves.extend(tables.target_moves(index, targets & pin_mask & check_mask))
+
+        for (piece_color, piece_type), slot in self.pieces.items():
+            pieces = boards[slot]
+            if piece_color != color or not pieces or piece_type is Pawn:
+                continue
+            if piece_type not in GENERATED:
+                moves.extend(
+                    move
+                    for piece in tuple(board.pieces)
+                    if piece.color == color and type(piece) is piece_type
+                    for move in piece.all_moves()
+                    if board.is_legal(move, check_info)
+                )
+                continue
+
+            while pieces:
+                bit = pieces & -pieces
+                index = bit.bit_length() - 1
+                targets = self.attacks_from(piece_type, index, occupied) & not_own
+                if piece_type is King:
+                    # The king steps onto squares no enemy attacks once it has
+                    # left its own square.
+                    if targets:
+                        targets &= ~self.attacked_squares(occupied & not_own, occupied ^ bit)
+                    moves.extend(tables.target_moves(index, targets))
+                elif index in pin_masks:
+                    add_pinned(index, targets)
+                else:
+                    moves.extend(tables.target_moves(index, targets & check_mask))
+                pieces ^= bit
+
+        for (direction, capture_axis), slot in self.pawns.items():
+            pawns = boards[slot] & own
+            while pawns:
+                bit = pawns & -pawns
+                index = bit.bit_length() - 1
+                targets = tables.pawn_targets(index, direction, capture_axis, occupied) & not_own
+                if index in pin_masks:
+                    add_pinned(index, targets)
+                else:
+                    moves.extend(tables.target_moves(index, targets & check_mask))
+                pawns ^= bit
+
+        return moves
+
+
+def lowest(bits: int) -> int:
+    return (bits & -bits).bit_length() - 1
+
+
+def highest(bits: int) -> int:
+    return bits.bit_length() - 1
+
+
+GENERATED = frozenset((Queen, Rook, Bishop, King, Knight, Pawn))
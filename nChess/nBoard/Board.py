@@ -1,5 +1,5 @@
 from nChess.Piece import Piece
-from nChess.nBoard import nBoard, Color
+from nChess.nBoard import nBoard, Color, Backend
 from nChess.Piece.Bishop import Bishop
 from nChess.Piece.King import King
 from nChess.Piece.Knight import Knight
@@ -51,5 +51,5 @@ Pieces = [
 
 
 class Board(nBoard):
-    def __init__(self):
-        super().__init__(2, (8, 8), 0, TurnOrder, deepcopy(Pieces))
+    def __init__(self, backend: Backend = Backend.object):
+        super().__init__(2, (8, 8), 0, TurnOrder, deepcopy(Pieces), backend)
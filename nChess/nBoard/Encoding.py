@@ -0,0 +1,347 @@
+import re
+import struct
+from dataclasses import dataclass
+from enum import Enum
+from itertools import chain
+from typing import Iterable, Iterator, Type
+
+from nChess.nBoard import nBoard, IntegerVector, Color, Backend
+from nChess.nBoard.Geometry import geometry
+from nChess.nBoard.Zobrist import color_name
+from nChess.Piece import Piece
+from nChess.Piece.Bishop import Bishop
+from nChess.Piece.King import King
+from nChess.Piece.Knight import Knight
+from nChess.Piece.Pawn import Pawn
+from nChess.Piece.Queen import Queen
+from nChess.Piece.Rook import Rook
+
+# Square codes: bits 0-2 hold the piece type (0 for an empty square), bits 3-4
+# the index of the piece's color in the color table and bits 5-7 the capture
+# axis of pawns. The color table is the turn order followed by the colors of
+# the pieces that are not in it, by name.
+PIECE_TYPES: tuple[Type[Piece], ...] = (King, Queen, Rook, Bishop, Knight, Pawn)
+LETTERS = "KQRBNP"
+
+MAGIC = b"nB"
+VERSION = 2
+
+
+@dataclass(frozen=True)
+class Header:
+    """Layout of an encoded position: everything but the turn number, which
+    follows the header bytes."""
+
+    dimension: int
+    size: IntegerVector
+    # Color names of the color table; the turn order is its first turns entries.
+    colors: tuple[str, ...]
+    turns: int
+    # Offsets of the square codes and of the has_moved bitset in the buffer.
+    codes: int
+    moved: int
+
+    @property
+    def cells(self) -> int:
+        return self.moved - self.codes
+
+    @property
+    def turn_order(self) -> tuple[str, ...]:
+        return self.colors[:self.turns]
+
+
+headers: dict[bytes, Header] = {}
+
+
+def color_table(board: nBoard, pieces: Iterable[Piece] = ()) -> tuple[Color, ...]:
+    """The turn order of board, then the other colors of its pieces and of
+    pieces by name."""
+    others = {piece.color for piece in chain(board.pieces, pieces)}.difference(board.turn_order)
+    colors = board.turn_order + tuple(sorted(others, key=color_name))
+    assert len(colors) <= 4, f"cannot encode more than 4 colors, got {', '.join(map(color_name, colors))}"
+    return colors
+
+
+def color_type(board: nBoard) -> Type[Enum]:
+    """The enum of the colors of board, to decode its encodings with."""
+    colors = color_table(board)
+    return type(colors[0]) if colors and isinstance(colors[0], Enum) else None
+
+
+def piece_code(piece: Piece, colors: tuple[Color, ...]) -> int:
+    color = colors.index(piece.color)
+    capture_axis = piece.capture_axis if isinstance(piece, Pawn) else 0
+    assert capture_axis < 8
+    return PIECE_TYPES.index(type(piece)) + 1 | color << 3 | capture_axis << 5
+
+
+def make_piece(code: int, position: IntegerVector, colors: tuple[Color, ...], has_moved: bool) -> Piece:
+    piece_type = PIECE_TYPES[(code & 7) - 1]
+    color = colors[code >> 3 & 3]
+    if piece_type is Pawn:
+        return Pawn(position, color, has_moved, None, code >> 5)
+    return piece_type(position, color, has_moved)
+
+
+def resolve_colors(names: tuple[str, ...], colors: Type[Enum]) -> tuple[Color, ...]:
+    if colors is None:
+        from nChess.nBoard.Board import ClassicColor
+        colors = ClassicColor
+    return tuple(colors[name] for name in names)
+
+
+def encode_header(board: nBoard, colors: tuple[Color, ...]) -> bytes:
+    """Magic, version, header length, dimension, size, the length of the turn
+    order, then the color names of the color table, each prefixed by its
+    length."""
+    names = [color_name(color).encode() for color in colors]
+    body = struct.pack(f"<B{board.dimension}BBB", board.dimension, *board.size, len(board.turn_order), len(names))
+    body += b"".join(struct.pack("B", len(name)) + name for name in names)
+    return struct.pack("<2sBH", MAGIC, VERSION, 5 + len(body)) + body
+
+
+class SquareCodes:
+    """Square codes and has_moved bits of a board, kept current through the
+    occupy/vacate notifications so that encoding costs a few copies."""
+
+    board: nBoard
+    colors: tuple[Color, ...]
+    header: bytes
+    codes: bytearray
+    moved: bytearray
+
+    def __init__(self, board: nBoard):
+        self.board = board
+        self.colors = color_table(board)
+        self.header = encode_header(board, self.colors)
+        self.codes = bytearray(len(board.occupancy))
+        self.moved = bytearray((len(board.occupancy) + 7) // 8)
+        self.piece_codes = {}
+
+        for piece in board.pieces:
+            self.occupy(piece, board.flat_index(piece.position))
+        board.listeners.append(self)
+
+    @classmethod
+    def of(cls, board: nBoard) -> "SquareCodes":
+        codes = tracked_codes(board)
+        return codes if codes is not None else cls(board)
+
+    def detach(self):
+        self.board.listeners.remove(self)
+
+    def occupy(self, piece: Piece, index: int):
+        code = self.piece_codes.get(piece)
+        if code is None:
+            if piece.color not in self.colors:
+                self.add_color(piece)
+            code = self.piece_codes[piece] = piece_code(piece, self.colors)
+        self.codes[index] = code
+        if piece.has_moved:
+            self.moved[index >> 3] |= 1 << (index & 7)
+
+    def add_color(self, piece: Piece):
+        """Extends the color table with the color of piece and recodes the
+        board."""
+        colors = color_table(self.board, (piece,))
+        remap = [colors.index(color) for color in self.colors]
+        self.colors = colors
+        self.header = encode_header(self.board, colors)
+        self.piece_codes = {}
+        for index, code in enumerate(self.codes):
+            if code:
+                self.codes[index] = code & ~(3 << 3) | remap[code >> 3 & 3] << 3
+
+    def vacate(self, piece: Piece, index: int):
+        self.codes[index] = 0
+        self.moved[index >> 3] &= ~(1 << (index & 7))
+
+    def to_bytes(self) -> bytes:
+        return b"".join((self.header, struct.pack("<I", self.board.turn_number), self.codes, self.moved))
+
+
+def tracked_codes(board: nBoard) -> SquareCodes:
+    """The SquareCodes listener of board, or None if it does not track them."""
+    for listener in board.listeners:
+        if isinstance(listener, SquareCodes):
+            return listener
+    return None
+
+
+def to_bytes(board: nBoard) -> bytes:
+    """Header, turn number, one code byte per square in flat index order, then
+    the has_moved bits of the squares, least significant bit first.
+
+    Boards that track their codes, see nBoard.track_codes, only copy their
+    buffers; others are encoded from their pieces.
+    """
+    codes = tracked_codes(board)
+    if codes is not None:
+        return codes.to_bytes()
+
+    colors = color_table(board)
+    cells = len(board.occupancy)
+    codes = bytearray(cells)
+    moved = 0
+    for piece in board.pieces:
+        index = board.flat_index(piece.position)
+        codes[index] = piece_code(piece, colors)
+        if piece.has_moved:
+            moved |= 1 << index
+    return b"".join((
+        encode_header(board, colors),
+        struct.pack("<I", board.turn_number),
+        codes,
+        moved.to_bytes((cells + 7) // 8, "little")
+    ))
+
+
+def same_position(board: nBoard, other: nBoard) -> bool:
+    """Whether the boards hold the same pieces with the same has_moved flags and
+    the same side to move, whatever their turn numbers."""
+    if board.size != other.size or board.current_turn() != other.current_turn():
+        return False
+    encoded, other_encoded = to_bytes(board), to_bytes(other)
+    codes = read_header(encoded).codes
+    return encoded[:codes - 4] == other_encoded[:codes - 4] and encoded[codes:] == other_encoded[codes:]
+
+
+def read_header(buffer) -> Header:
+    buffer = memoryview(buffer)
+    magic, version, length = struct.unpack_from("<2sBH", buffer)
+    assert magic == MAGIC and version in (1, VERSION)
+
+    key = bytes(buffer[:length])
+    header = headers.get(key)
+    if header is not None:
+        return header
+
+    dimension = buffer[5]
+    size = tuple(buffer[6:6 + dimension])
+    # Version 1 headers have no color table: their colors are the turn order.
+    offset = 6 + dimension + version
+    names = []
+    for _ in range(buffer[offset - 1]):
+        names.append(bytes(buffer[offset + 1:offset + 1 + buffer[offset]]).decode())
+        offset += 1 + buffer[offset]
+    turns = buffer[6 + dimension] if version > 1 else len(names)
+
+    codes = length + 4
+    header = headers[key] = Header(dimension, size, tuple(names), turns, codes, codes + geometry(dimension, size).cells)
+    return header
+
+
+def decode(buffer) -> tuple[Header, int, memoryview, int]:
+    """Header, turn number, square codes and has_moved bits of an encoded
+    position, without building a board; the codes are a view into buffer."""
+    header = read_header(buffer)
+    view = memoryview(buffer)
+    turn_number, = struct.unpack_from("<I", view, header.codes - 4)
+    moved = int.from_bytes(view[header.moved:header.moved + (header.cells + 7) // 8], "little")
+    return header, turn_number, view[header.codes:header.moved], moved
+
+
+def occupied(codes) -> Iterator[tuple[int, int]]:
+    """(index, code) of the occupied squares of decoded codes."""
+    for match in re.finditer(rb"[^\x00]", codes):
+        yield match.start(), codes[match.start()]
+
+
+def from_bytes(buffer, colors: Type[Enum] = None, backend: Backend = Backend.object) -> nBoard:
+    """Rebuilds a board encoded by to_bytes; color names are looked up in colors,
+    ClassicColor by default."""
+    header, turn_number, codes, moved = decode(buffer)
+    colors = resolve_colors(header.colors, colors)
+    positions = geometry(header.dimension, header.size).positions
+    board = nBoard(header.dimension, header.size, turn_number, colors[:header.turns], None, backend)
+
+    pieces = []
+    indices = []
+    for index, code in occupied(codes):
+        pieces.append(make_piece(code, positions[index], colors, bool(moved >> index & 1)))
+        indices.append(index)
+    board.load(pieces, indices)
+    return board
+
+
+# nFEN lists the squares in flat index order: runs along the last axis are
+# separated by "/", one more "/" for each further axis whose coordinate
+# changes. Pieces of the first color of the color table are upper case and
+# those of the second lower case; "'" marks a moved piece and "[<axis>]" a
+# pawn with another capture axis. The fields that follow are the size, the turn
+# number and the turn order ("-" if empty), then the color table if it is not
+# the turn order.
+NFEN_TOKEN = re.compile(r"(\d+)|([KQRBNPkqrbnp])(')?(?:\[(\d+)\])?|(/+)")
+
+
+def to_nfen(board: nBoard) -> str:
+    colors = color_table(board)
+    assert len(colors) <= 2, f"nFEN has letters for 2 colors, got {', '.join(map(color_name, colors))}"
+    strides = board.strides
+    occupants = board.occupants
+    text = []
+    empty = 0
+    for index, position in enumerate(board.tables.positions):
+        if index:
+            slashes = sum(1 for stride in strides[:-1] if index % stride == 0)
+            if slashes:
+                if empty:
+                    text.append(str(empty))
+                    empty = 0
+                text.append("/" * slashes)
+
+        piece = occupants.get(position)
+        if piece is None:
+            empty += 1
+            continue
+        if empty:
+            text.append(str(empty))
+            empty = 0
+
+        letter = LETTERS[PIECE_TYPES.index(type(piece))]
+        text.append(letter if piece.color == colors[0] else letter.lower())
+        if piece.has_moved:
+            text.append("'")
+        if isinstance(piece, Pawn) and piece.capture_axis:
+            text.append(f"[{piece.capture_axis}]")
+    if empty:
+        text.append(str(empty))
+
+    fields = [
+        "".join(text),
+        "x".join(map(str, board.size)),
+        str(board.turn_number),
+        ",".join(color_name(color) for color in board.turn_order) or "-"
+    ]
+    if colors != board.turn_order:
+        fields.append(",".join(color_name(color) for color in colors))
+    return " ".join(fields)
+
+
+def from_nfen(text: str, colors: Type[Enum] = None, backend: Backend = Backend.object) -> nBoard:
+    squares, size, turn_number, names, *table = text.split()
+    size = tuple(map(int, size.split("x")))
+    turn_order = resolve_colors(tuple(names.split(",")) if names != "-" else (), colors)
+    letter_colors = resolve_colors(tuple(table[0].split(",")), colors) if table else turn_order
+    positions = geometry(len(size), size).positions
+
+    pieces = []
+    index = 0
+    end = 0
+    for match in NFEN_TOKEN.finditer(squares):
+        assert match.start() == end, f"unexpected {squares[end:match.start()]!r} in nFEN"
+        end = match.end()
+        empty, letter, moved, capture_axis, _ = match.groups()
+        if empty:
+            index += int(empty)
+        elif letter:
+            piece_type = PIECE_TYPES[LETTERS.index(letter.upper())]
+            color = letter_colors[0 if letter.isupper() else 1]
+            if piece_type is Pawn:
+                pieces.append(Pawn(positions[index], color, bool(moved), None, int(capture_axis or 0)))
+            else:
+                pieces.append(piece_type(positions[index], color, bool(moved)))
+            index += 1
+    assert end == len(squares) and index == len(positions), "nFEN does not cover the board"
+
+    return nBoard(len(size), size, int(turn_number), turn_order, pieces, backend)
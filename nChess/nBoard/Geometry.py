@@ -0,0 +1,129 @@
+from functools import lru_cache
+from itertools import product
+
+from nChess.nBoard import IntegerVector
+
+
+class Geometry:
+    """Spatial data of a board shape: the piece offsets, the strides and flat
+    indices of the squares, and the AttackTables and ZobristKeys built on them.
+
+    geometry() interns one instance per (dimension, size), which every board of
+    that shape holds by reference, so building a board computes none of it.
+    Instances are shared and must not be changed.
+    """
+
+    dimension: int
+    size: IntegerVector
+    strides: IntegerVector
+    cells: int
+    positions: tuple[IntegerVector, ...]
+    indices: dict[IntegerVector, int]
+
+    cardinals: tuple[IntegerVector, ...]
+    diagonals: tuple[IntegerVector, ...]
+    L: tuple[IntegerVector, ...]
+    basis: tuple[IntegerVector, ...]
+
+    def __init__(self, dimension: int, size: IntegerVector):
+        assert len(size) == dimension
+        self.dimension = dimension
+        self.size = size
+        self.strides = self.compute_strides(size)
+        self.cells = self.compute_cells(size)
+        self.positions = tuple(product(*(range(x) for x in size)))
+        self.indices = {position: index for index, position in enumerate(self.positions)}
+
+        self.cardinals = self.compute_cardinals(dimension)
+        self.diagonals = self.compute_diagonals(dimension)
+        self.L = self.compute_L(dimension)
+        self.basis = self.compute_basis(dimension)
+
+        self._tables = None
+        self._zobrist = None
+
+    @staticmethod
+    def compute_cardinals(dimension: int) -> tuple[IntegerVector, ...]:
+        return tuple(
+            tuple(j if k == i else 0 for k in range(dimension))
+            for j in (-1, 1)
+            for i in range(dimension)
+        )
+
+    @staticmethod
+    def compute_diagonals(dimension: int) -> tuple[IntegerVector, ...]:
+        return tuple(
+            tuple((1, -1)[k] for k in j) + (0,) * (dimension - i)
+            for i in range(2, dimension + 1)
+            for j in product(range(2), repeat=i)
+        )
+
+    @staticmethod
+    def compute_L(dimension: int) -> tuple[IntegerVector, ...]:
+        return tuple(
+            tuple(
+                2 * p if k == i
+                else q if k == j
+                else 0
+                for k in range(dimension)
+            )
+            for i in range(dimension)
+            for j in range(dimension)
+            for p, q in product((-1, 1), repeat=2)
+            if i != j
+        )
+
+    @staticmethod
+    def compute_basis(dimension: int) -> tuple[IntegerVector, ...]:
+        return tuple(
+            tuple(
+                1 if i == j
+                else 0
+                for j in range(dimension)
+            )
+            for i in range(dimension)
+        )
+
+    @staticmethod
+    def compute_strides(size: IntegerVector) -> IntegerVector:
+        strides = [1] * len(size)
+        for i in range(len(size) - 2, -1, -1):
+            strides[i] = strides[i + 1] * size[i + 1]
+        return tuple(strides)
+
+    @staticmethod
+    def compute_cells(size: IntegerVector) -> int:
+        cells = 1
+        for x in size:
+            cells *= x
+        return cells
+
+    def in_bounds(self, position: IntegerVector) -> bool:
+        return all(0 <= x < self.size[i] for i, x in enumerate(position))
+
+    def flat_index(self, position: IntegerVector) -> int:
+        return self.indices[position]
+
+    @property
+    def tables(self) -> "AttackTables":
+        if self._tables is None:
+            from nChess.nBoard.AttackTables import attack_tables
+            self._tables = attack_tables(self.dimension, self.size)
+        return self._tables
+
+    @property
+    def zobrist(self) -> "ZobristKeys":
+        if self._zobrist is None:
+            from nChess.nBoard.Zobrist import zobrist_keys
+            self._zobrist = zobrist_keys(self.dimension, self.size)
+        return self._zobrist
+
+
+@lru_cache(maxsize=None)
+def interned_geometry(dimension: int, size: IntegerVector) -> Geometry:
+    return Geometry(dimension, size)
+
+
+def geometry(dimension: int, size: IntegerVector) -> Geometry:
+    """The Geometry of (dimension, size); size may be any sequence of ints."""
+    return interned_geometry(dimension, tuple(size))
@@ -0,0 +1,49 @@
+from nChess.nBoard import nBoard, Backend
+from nChess.nBoard.Board import ClassicColor, TurnOrder
+from nChess.Piece import Piece
+from nChess.Piece.Bishop import Bishop
+from nChess.Piece.King import King
+from nChess.Piece.Knight import Knight
+from nChess.Piece.Pawn import Pawn
+from nChess.Piece.Queen import Queen
+from nChess.Piece.Rook import Rook
+from typing import Type
+
+
+def back_rank(side: int) -> list[Type[Piece]]:
+    """Rooks on the ends, King and Queen in the middle, Knights and Bishops in between.
+
+    For side 8 this is the classic back rank of Board.
+    """
+    rank = [None] * side
+    for i in range(side // 2):
+        rank[i] = rank[side - i - 1] = Knight if i % 2 == 1 else Bishop
+    rank[0] = rank[side - 1] = Rook
+    rank[(side - 1) // 2] = King
+    if side > 1:
+        rank[(side - 1) // 2 + 1] = Queen
+    return rank
+
+
+class Hypercube(nBoard):
+    """A side^dimension start position generalizing Board and Tesseract.
+
+    White lines up along the first axis at the origin corner with its pawns one
+    step ahead on the second axis; Black does the same from the opposite corner.
+    """
+
+    def __init__(self, dimension: int, side: int, backend: Backend = Backend.object):
+        assert dimension >= 2 and side >= 4
+
+        rank = back_rank(side)
+        far = (side - 1,) * (dimension - 2)
+        near = (0,) * (dimension - 2)
+
+        pieces = []
+        for x, piece_type in enumerate(rank):
+            pieces.append(piece_type((x, 0, *near), ClassicColor.white))
+            pieces.append(Pawn((x, 1, *near), ClassicColor.white))
+            pieces.append(piece_type((x, side - 1, *far), ClassicColor.black))
+            pieces.append(Pawn((x, side - 2, *far), ClassicColor.black))
+
+        super().__init__(dimension, (side,) * dimension, 0, TurnOrder, pieces, backend)
@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import permutations, product
+
+from nChess.nBoard import nBoard, IntegerVector, Move
+from nChess.nBoard.Geometry import geometry
+from nChess.Piece.Pawn import Pawn
+
+
+@dataclass(frozen=True, slots=True)
+class Transform:
+    """Signed axis permutation: coordinate i of a position becomes coordinate
+    permutation[i], reflected across the board when signs[i] is -1."""
+
+    permutation: IntegerVector
+    signs: IntegerVector
+
+    @property
+    def is_identity(self) -> bool:
+        return self.permutation == tuple(range(len(self.permutation))) and all(sign > 0 for sign in self.signs)
+
+    def offset(self, offset: IntegerVector) -> IntegerVector:
+        result = [0] * len(offset)
+        for i, x in enumerate(offset):
+            result[self.permutation[i]] = self.signs[i] * x
+        return tuple(result)
+
+    def position(self, position: IntegerVector, size: IntegerVector) -> IntegerVector:
+        result = [0] * len(position)
+        for i, x in enumerate(position):
+            result[self.permutation[i]] = x if self.signs[i] > 0 else size[i] - 1 - x
+        return tuple(result)
+
+    def move(self, move: Move, size: IntegerVector) -> Move:
+        return Move(self.position(move.initial_position, size), self.position(move.final_position, size))
+
+    def inverse(self) -> "Transform":
+        permutation = [0] * len(self.permutation)
+        signs = [0] * len(self.signs)
+        for i, axis in enumerate(self.permutation):
+            permutation[axis] = i
+            signs[axis] = self.signs[i]
+        return Transform(tuple(permutation), tuple(signs))
+
+
+class Symmetry:
+    """Symmetries of a board geometry: the signed axis permutations that keep the
+    size and the cardinal, diagonal and knight offsets, so that they map every
+    piece's moves onto the moves of the transformed piece.
+
+    Pawns restrict them further, see transforms_of. The identity comes first.
+    """
+
+    dimension: int
+    size: IntegerVector
+    transforms: tuple[Transform, ...]
+
+    def __init__(self, dimension: int, size: IntegerVector):
+        self.dimension = dimension
+        self.size = size
+        self.geometry = geometry(dimension, size)
+
+        offsets = (set(self.geometry.cardinals), set(self.geometry.diagonals), set(self.geometry.L))
+        transforms = []
+        for permutation in permutations(range(dimension)):
+            if any(size[axis] != size[i] for i, axis in enumerate(permutation)):
+                continue
+            for signs in product((1, -1), repeat=dimension):
+                transform = Transform(permutation, signs)
+                if all({transform.offset(offset) for offset in group} == group for group in offsets):
+                    transforms.append(transform)
+        self.transforms = tuple(transforms)
+
+        self._index_maps = {}
+
+    def index_map(self, transform: Transform) -> tuple[int, ...]:
+        """Flat index of the image of every square, by flat index."""
+        index_map = self._index_maps.get(transform)
+        if index_map is None:
+            indices = self.geometry.indices
+            index_map = self._index_maps[transform] = tuple(
+                indices[transform.position(position, self.size)] for position in self.geometry.positions
+            )
+        return index_map
+
+    def transforms_of(self, board: nBoard) -> tuple[Transform, ...]:
+        """The transforms that keep the position's moves and its evaluation.
+
+        Pawns advance along every axis but their capture axis and are scored
+        by files along axis 0, so with pawns on the board axis 0 stays in
+        place and the forward axes keep their direction; axis 0 may only be
+        reflected if every pawn captures along it.
+        """
+        pawns = [piece for piece in board.pieces if isinstance(piece, Pawn)]
+        if not pawns:
+            return self.transforms
+
+        reflect_files = all(pawn.capture_axis == 0 for pawn in pawns)
+        return tuple(
+            transform
+            for transform in self.transforms
+            if transform.permutation[0] == 0
+            and all(sign > 0 for sign in transform.signs[1:])
+            and (transform.signs[0] > 0 or reflect_files)
+        )
+
+    def key(self, board: nBoard, transform: Transform) -> int:
+        """hash_key of the board transform would give, without building it."""
+        if transform.is_identity:
+            return board.hash_key
+
+        index_map = self.index_map(transform)
+        zobrist = board.zobrist
+        key = board.side_key()
+        for piece in board.pieces:
+            index = index_map[board.flat_index(piece.position)]
+            axis = transform.permutation[piece.capture_axis] if isinstance(piece, Pawn) else 0
+            key ^= zobrist.piece(piece.color, type(piece), index, axis)
+            if piece.has_moved:
+                key ^= zobrist.moved(index)
+        return key
+
+
+@lru_cache(maxsize=None)
+def symmetry(dimension: int, size: IntegerVector) -> Symmetry:
+    return Symmetry(dimension, size)
+
+
+def transform_board(board: nBoard, transform: Transform) -> nBoard:
+    pieces = []
+    for piece in board.pieces:
+        position = transform.position(piece.position, board.size)
+        if isinstance(piece, Pawn):
+            pieces.append(Pawn(position, piece.color, piece.has_moved, None, transform.permutation[piece.capture_axis]))
+        else:
+            pieces.append(type(piece)(position, piece.color, piece.has_moved))
+    return nBoard(board.dimension, board.size, board.turn_number, board.turn_order, pieces, board.backend)
+
+
+def canonical_key(board: nBoard) -> tuple[int, Transform]:
+    """The smallest hash_key among the symmetric images of the position, and the
+    transform that gives it. Symmetric positions share their canonical key."""
+    group = symmetry(board.dimension, board.size)
+    return min(
+        ((group.key(board, transform), transform) for transform in group.transforms_of(board)),
+        key=lambda entry: entry[0]
+    )
+
+
+def canonicalize(board: nBoard) -> tuple[nBoard, Transform]:
+    """The canonical representative of the position and the transform mapping
+    board onto it; moves found on the representative map back through
+    transform.inverse()."""
+    _, transform = canonical_key(board)
+    return transform_board(board, transform), transform
@@ -0,0 +1,38 @@
+from nChess.nBoard import nBoard, Backend
+from nChess.nBoard.Board import ClassicColor, TurnOrder
+from nChess.Piece.King import King
+from nChess.Piece.Pawn import Pawn
+from nChess.Piece.Queen import Queen
+from nChess.Piece.Rook import Rook
+from copy import deepcopy
+
+
+WhitePawns = [Pawn((x, 1, 0, 0), ClassicColor.white) for x in range(4)]
+WhiteRoyalty = [
+    Rook((0, 0, 0, 0), ClassicColor.white),
+    King((1, 0, 0, 0), ClassicColor.white),
+    Queen((2, 0, 0, 0), ClassicColor.white),
+    Rook((3, 0, 0, 0), ClassicColor.white)
+]
+
+BlackPawns = [Pawn((x, 2, 3, 3), ClassicColor.black) for x in range(4)]
+BlackRoyalty = [
+    Rook((0, 3, 3, 3), ClassicColor.black),
+    Queen((1, 3, 3, 3), ClassicColor.black),
+    King((2, 3, 3, 3), ClassicColor.black),
+    Rook((3, 3, 3, 3), ClassicColor.black)
+]
+
+Pieces = [
+    *WhitePawns,
+    *WhiteRoyalty,
+    *BlackPawns,
+    *BlackRoyalty
+]
+
+
+class Tesseract(nBoard):
+    """The 4x4x4x4 setup played in the GUI demo."""
+
+    def __init__(self, backend: Backend = Backend.object):
+        super().__init__(4, (4, 4, 4, 4), 0, TurnOrder, deepcopy(Pieces), backend)
@@ -0,0 +1,78 @@
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Type
+
+from nChess.nBoard import IntegerVector, Color
+from nChess.nBoard.Geometry import geometry
+
+
+def zobrist_key(*label) -> int:
+    """A 64-bit key derived from label, stable across processes and runs."""
+    return int.from_bytes(blake2b(repr(label).encode(), digest_size=8).digest(), "little")
+
+
+def color_name(color: Color) -> str:
+    return getattr(color, "name", repr(color))
+
+
+class ZobristKeys:
+    """Zobrist keys for a board geometry: one per (square, color, piece type,
+    capture axis), one per square for the has_moved flag and one per side to
+    move. Only pawns have a capture axis; every other piece uses axis 0.
+
+    Keys are derived from their labels rather than drawn from a generator, so
+    hashes stored on disk stay valid; they are computed on first use. Labels of
+    axis 0 leave the axis out, as they did before pawns were keyed by it.
+    """
+
+    dimension: int
+    size: IntegerVector
+    cells: int
+
+    def __init__(self, dimension: int, size: IntegerVector):
+        self.dimension = dimension
+        self.size = size
+        self.cells = geometry(dimension, size).cells
+
+        self._pieces = {}
+        self._moved = [None] * self.cells
+        self._sides = {}
+
+    @staticmethod
+    def axis(piece: "Piece") -> int:
+        """The capture axis piece is keyed by."""
+        return getattr(piece, "capture_axis", 0)
+
+    def piece_keys(self, color: Color, piece_type: Type["Piece"], axis: int = 0) -> list[int]:
+        """Per-square keys of a (color, piece type, capture axis), filled in by
+        piece()."""
+        key = (color, piece_type, axis)
+        keys = self._pieces.get(key)
+        if keys is None:
+            keys = self._pieces[key] = [None] * self.cells
+        return keys
+
+    def piece(self, color: Color, piece_type: Type["Piece"], index: int, axis: int = 0) -> int:
+        keys = self.piece_keys(color, piece_type, axis)
+        key = keys[index]
+        if key is None:
+            label = ("piece", self.size, color_name(color), piece_type.__name__, index)
+            key = keys[index] = zobrist_key(*label, axis) if axis else zobrist_key(*label)
+        return key
+
+    def moved(self, index: int) -> int:
+        key = self._moved[index]
+        if key is None:
+            key = self._moved[index] = zobrist_key("moved", self.size, index)
+        return key
+
+    def side(self, color: Color) -> int:
+        key = self._sides.get(color)
+        if key is None:
+            key = self._sides[color] = zobrist_key("side", self.size, color_name(color))
+        return key
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(dimension: int, size: IntegerVector) -> ZobristKeys:
+    return ZobristKeys(dimension, size)
@@ -1,10 +1,48 @@
-from typing import TypeVar
+from typing import Callable, Iterator, TypeVar
 from copy import deepcopy
+from dataclasses import dataclass
+from enum import Enum, auto
 
 IntegerVector = tuple[int, ...]
 Color = TypeVar("Color")
 
 
+class Backend(Enum):
+    """Storage engine used by nBoard for move generation and attack detection."""
+
+    object = auto()
+    bitboard = auto()
+    # Runs both engines and asserts they agree.
+    cross_check = auto()
+
+
+@dataclass(frozen=True, slots=True)
+class UndoRecord:
+    move: "Move"
+    piece: "Piece"
+    has_moved: bool
+    turn_number: int
+    captured: "Piece" = None
+    captured_index: int = None
+
+
+@dataclass(frozen=True, slots=True)
+class CheckInfo:
+    color: Color
+    checkers: tuple["Piece", ...]
+    pinned: frozenset["Piece"]
+    # Bitboard backend only, see Bitboards.check_info: the squares moves other
+    # than the king's must land on (None if every move must be verified) and,
+    # by the flat index of each pinned piece, the squares it may move to (None
+    # if its moves must be verified).
+    check_mask: int = None
+    pin_masks: dict[int, int] = None
+
+    def requires_verification(self, piece: "Piece") -> bool:
+        """Whether the pseudo-legal moves of piece may leave its king in check."""
+        return bool(self.checkers) or piece in self.pinned or isinstance(piece, King)
+
+
 class nBoard:
     dimension: int
     size: IntegerVector
@@ -12,10 +50,33 @@ class nBoard:
     turn_number: int
     turn_order: tuple[Color, ...]
 
+    strides: IntegerVector
+    occupancy: list[int]
+    occupants: dict[IntegerVector, "Piece"]
+    next_piece_id: int
+
     cardinals: tuple[IntegerVector, ...]
     diagonals: tuple[IntegerVector, ...]
     L: tuple[IntegerVector, ...]
     basis: tuple[IntegerVector, ...]
+    geometry: "Geometry"
+    tables: "AttackTables"
+
+    backend: Backend
+    bitboards: "Bitboards"
+    # Notified through occupy(piece, index) and vacate(piece, index) whenever a
+    # piece is put on or taken off a square.
+    listeners: list
+
+    zobrist: "ZobristKeys"
+    zobrist_rows: dict["Piece", list[int]]
+    hash_key: int
+    # Zobrist key of the pawns alone, for pawn structure caches.
+    pawn_key: int
+
+    # Legal moves by position, valid while hash_key is move_cache_key.
+    move_cache: dict[IntegerVector, tuple["Move", ...]]
+    move_cache_key: int
 
     def __init__(
         self,
@@ -23,7 +84,8 @@ class nBoard:
         size: IntegerVector,
         turn_number: int = 0,
         turn_order: tuple[Color, ...] = None,
-        pieces: list["Piece"] = None
+        pieces: list["Piece"] = None,
+        backend: Backend = Backend.object
     ):
         if turn_order is None:
             turn_order = ()
@@ -31,63 +93,146 @@ class nBoard:
         if pieces is None:
             pieces = []
 
+        self.geometry = geometry(dimension, size)
         self.dimension = dimension
-        self.size = size
+        self.size = self.geometry.size
         self.turn_number = turn_number
         self.turn_order = turn_order
         self.pieces = pieces
 
-        self.cardinals = self.compute_cardinals(self.dimension)
-        self.diagonals = self.compute_diagonals(self.dimension)
-        self.L = self.compute_L(self.dimension)
-        self.basis = self.compute_basis(self.dimension)
+        self.cardinals = self.geometry.cardinals
+        self.diagonals = self.geometry.diagonals
+        self.L = self.geometry.L
+        self.basis = self.geometry.basis
+        self.tables = self.geometry.tables
+
+        self.strides = self.geometry.strides
+        self.occupancy = [0] * self.geometry.cells
+        self.occupants = {}
+        self.next_piece_id = 1
+
+        self.backend = backend
+        self.bitboards = Bitboards(self) if self.backend is not Backend.object else None
+        self.listeners = []
+
+        self.zobrist = self.geometry.zobrist
+        self.zobrist_rows = {}
+        self.hash_key = self.side_key()
+        self.pawn_key = 0
+
+        self.move_cache = {}
+        self.move_cache_key = None
 
         for piece in self.pieces:
             piece.set_board(self)
+            self.occupy(piece)
+
+    def flat_index(self, position: IntegerVector) -> int:
+        return self.geometry.indices[position]
+
+    def occupy(self, piece: "Piece"):
+        assert piece.position not in self.occupants
+        if piece.piece_id is None:
+            piece.piece_id = self.next_piece_id
+            self.next_piece_id += 1
+        index = self.flat_index(piece.position)
+        self.occupants[piece.position] = piece
+        self.occupancy[index] = piece.piece_id
+        if self.bitboards is not None:
+            self.bitboards.occupy(piece, index)
+        for listener in self.listeners:
+            listener.occupy(piece, index)
+        self.hash_key ^= self.piece_key(piece, index)
+        if isinstance(piece, Pawn):
+            self.pawn_key ^= self.zobrist.piece(piece.color, type(piece), index, piece.capture_axis)
+
+    def load(self, pieces: list["Piece"], indices: list[int]):
+        """Places pieces on the squares at indices of a board without pieces or
+        listeners, filling the occupancy and the keys directly."""
+        assert not self.pieces and not self.listeners
+        if self.bitboards is not None:
+            for piece in pieces:
+                self.pieces.append(piece)
+                piece.set_board(self)
+                self.occupy(piece)
+            return
+
+        zobrist = self.zobrist
+        occupants = self.occupants
+        occupancy = self.occupancy
+        hash_key = self.hash_key
+        pawn_key = self.pawn_key
+        piece_id = self.next_piece_id
+        for piece, index in zip(pieces, indices):
+            piece.board = self
+            piece.piece_id = piece_id
+            occupants[piece.position] = piece
+            occupancy[index] = piece_id
+            piece_id += 1
+
+            key = zobrist.piece(piece.color, type(piece), index, zobrist.axis(piece))
+            if type(piece) is Pawn:
+                pawn_key ^= key
+            if piece.has_moved:
+                key ^= zobrist.moved(index)
+            hash_key ^= key
+
+        self.pieces.extend(pieces)
+        self.next_piece_id = piece_id
+        self.hash_key = hash_key
+        self.pawn_key = pawn_key
+
+    def vacate(self, piece: "Piece"):
+        assert self.occupants.get(piece.position) is piece
+        index = self.flat_index(piece.position)
+        del self.occupants[piece.position]
+        self.occupancy[index] = 0
+        if self.bitboards is not None:
+            self.bitboards.vacate(piece, index)
+        for listener in self.listeners:
+            listener.vacate(piece, index)
+        self.hash_key ^= self.piece_key(piece, index)
+        if isinstance(piece, Pawn):
+            self.pawn_key ^= self.zobrist.piece(piece.color, type(piece), index, piece.capture_axis)
+
+    def piece_key(self, piece: "Piece", index: int) -> int:
+        row = self.zobrist_rows.get(piece)
+        if row is None:
+            row = self.zobrist_rows[piece] = self.zobrist.piece_keys(piece.color, type(piece), self.zobrist.axis(piece))
+        key = row[index]
+        if key is None:
+            key = self.zobrist.piece(piece.color, type(piece), index, self.zobrist.axis(piece))
+        if piece.has_moved:
+            key ^= self.zobrist.moved(index)
+        return key
+
+    def side_key(self) -> int:
+        color = self.current_turn()
+        return 0 if color is None else self.zobrist.side(color)
+
+    def __reduce__(self):
+        """Pickles as a plain nBoard rebuilt from its pieces: no tables, bitboards,
+        caches or listeners, and no back-references through Piece.board."""
+        return nBoard, (self.dimension, self.size, self.turn_number, self.turn_order, list(self.pieces), self.backend)
+
+    def to_bytes(self) -> bytes:
+        return Encoding.to_bytes(self)
+
+    def track_codes(self) -> "Encoding.SquareCodes":
+        """Keeps the square codes of the board current through its listeners,
+        so that to_bytes only copies them; detach() on the result stops it."""
+        return Encoding.SquareCodes.of(self)
 
     @staticmethod
-    def compute_cardinals(dimension: int) -> tuple[IntegerVector, ...]:
-        return tuple(
-            tuple(j if k == i else 0 for k in range(dimension))
-            for j in (-1, 1)
-            for i in range(dimension)
-        )
+    def from_bytes(buffer, colors: type[Enum] = None, backend: Backend = Backend.object) -> "nBoard":
+        return Encoding.from_bytes(buffer, colors, backend)
 
-    @staticmethod
-    def compute_diagonals(dimension: int) -> tuple[IntegerVector, ...]:
-        from itertools import product
-        return tuple(
-            tuple((1, -1)[k] for k in j) + (0,) * (dimension - i)
-            for i in range(2, dimension + 1)
-            for j in product(range(2), repeat=i)
-        )
+    def to_nfen(self) -> str:
+        return Encoding.to_nfen(self)
 
     @staticmethod
-    def compute_L(dimension: int) -> tuple[IntegerVector, ...]:
-        from itertools import product
-        return tuple(
-            tuple(
-                2 * p if k == i
-                else q if k == j
-                else 0
-                for k in range(dimension)
-            )
-            for i in range(dimension)
-            for j in range(dimension)
-            for p, q in product((-1, 1), repeat=2)
-            if i != j
-        )
-
-    @staticmethod
-    def compute_basis(dimension: int) -> tuple[IntegerVector, ...]:
-        return tuple(
-            tuple(
-                1 if i == j
-                else 0
-                for j in range(dimension)
-            )
-            for i in range(dimension)
-        )
+    def from_nfen(text: str, colors: type[Enum] = None, backend: Backend = Backend.object) -> "nBoard":
+        return Encoding.from_nfen(text, colors, backend)
 
     def copy(self) -> "nBoard":
         return nBoard(
@@ -95,11 +240,22 @@ class nBoard:
             self.size,
             self.turn_number,
             self.turn_order,
-            deepcopy(self.pieces)
+            deepcopy(self.pieces),
+            self.backend
+        )
+
+    def __hash__(self) -> int:
+        return self.hash_key
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, nBoard)
+            and self.size == other.size
+            and self.hash_key == other.hash_key
         )
 
     def in_bounds(self, position: IntegerVector) -> bool:
-        return all(0 <= x < self.size[i] for i, x in enumerate(position))
+        return self.geometry.in_bounds(position)
 
     def current_turn(self) -> Color:
         if len(self.turn_order) == 0:
@@ -107,38 +263,92 @@ class nBoard:
         return self.turn_order[self.turn_number % len(self.turn_order)]
 
     def next_turn(self):
-        self.turn_number += 1
+        self.set_turn_number(self.turn_number + 1)
+
+    def set_turn_number(self, turn_number: int):
+        self.hash_key ^= self.side_key()
+        self.turn_number = turn_number
+        self.hash_key ^= self.side_key()
 
     def contains(self, position: IntegerVector) -> bool:
-        for piece in self.pieces:
-            if piece.position == position:
-                return True
+        return position in self.occupants
 
     def add(self, piece_type, position: IntegerVector, color, *args, **kwargs):
         assert not self.contains(position)
-        self.pieces.append(piece_type(position, color, *args, board=self, **kwargs))
+        piece = piece_type(position, color, *args, board=self, **kwargs)
+        self.pieces.append(piece)
+        self.occupy(piece)
 
     def get(self, position: IntegerVector) -> "Piece":
         assert self.contains(position)
-        for piece in self.pieces:
-            if piece.position == position:
-                return piece
+        return self.occupants[position]
 
     def remove(self, position: IntegerVector):
         assert self.contains(position)
-        self.pieces.pop(self.pieces.index(self.get(position)))
+        piece = self.occupants[position]
+        self.vacate(piece)
+        self.pieces.remove(piece)
+
+    def relocate(self, move: "Move", has_moved: bool = None):
+        piece = self.get(move.initial_position)
+        self.vacate(piece)
+        piece.move(move)
+        if has_moved is not None:
+            piece.has_moved = has_moved
+        self.occupy(piece)
 
     def move(self, move: "Move", force: bool = False):
         assert self.contains(move.initial_position)
         assert not self.move_in_conflict(move, force=force)
 
+        self.make_move(move, force=force)
+
+    def make_move(self, move: "Move", force: bool = False) -> UndoRecord:
+        piece = self.get(move.initial_position)
+
+        if self.contains(move.final_position):
+            captured = self.get(move.final_position)
+            record = UndoRecord(
+                move, piece, piece.has_moved, self.turn_number,
+                captured, self.pieces.index(captured)
+            )
+            self.remove(move.final_position)
+        else:
+            record = UndoRecord(move, piece, piece.has_moved, self.turn_number)
+
         if not force:
             self.next_turn()
 
-        if self.contains(move.final_position):
+        self.relocate(move, has_moved=True)
+
+        return record
+
+    def unmake_move(self, record: UndoRecord):
+        move = record.move
+        piece = self.get(move.final_position)
+
+        # A promotion leaves a different piece on the final square; the
+        # original one is put back in its place.
+        if piece is not record.piece:
             self.remove(move.final_position)
+            self.pieces.append(record.piece)
+            record.piece.position = move.final_position
+            self.occupy(record.piece)
 
-        self.get(move.initial_position).move(move)
+        self.relocate(Move(move.final_position, move.initial_position), has_moved=record.has_moved)
+
+        if record.captured is not None:
+            self.pieces.insert(record.captured_index, record.captured)
+            self.occupy(record.captured)
+
+        self.set_turn_number(record.turn_number)
+
+    def leaves_in_check(self, move: "Move") -> bool:
+        color = self.get(move.initial_position).color
+        record = self.make_move(move, force=True)
+        in_check = self.in_check(color)
+        self.unmake_move(record)
+        return in_check
 
     def find(self, piece_data: "PieceData") -> tuple[IntegerVector]:
         return tuple(
@@ -158,58 +368,226 @@ class nBoard:
                 self.get(move.initial_position).color == self.current_turn()
                 or force
             ) and (
-                not self.assume_move(move).in_check(
-                    self.get(move.initial_position).color)
+                not self.leaves_in_check(move)
             )
         )
 
-    def assume_move(self, move: "Move", force: bool = False) -> "nBoard":
-        new_board = self.copy()
+    def iter_attackers(self, position: IntegerVector, is_attacker: Callable[[Color], bool]) -> Iterator["Piece"]:
+        """Yields the pieces attacking position whose color satisfies is_attacker,
+        looking outward from position along rays and leaper offsets."""
+        occupancy = self.occupancy
+        occupants = self.occupants
+        positions = self.tables.positions
+        index = self.flat_index(position)
+
+        for rays, slider in ((self.tables.cardinal_rays(index), Rook), (self.tables.diagonal_rays(index), Bishop)):
+            for ray in rays:
+                for distance, target in enumerate(ray):
+                    if occupancy[target]:
+                        piece = occupants[positions[target]]
+                        if is_attacker(piece.color) and (
+                            isinstance(piece, (slider, Queen))
+                            or (distance == 0 and isinstance(piece, King))
+                        ):
+                            yield piece
+                        break
+
+        for source, partial_indices in self.tables.knight_targets(index):
+            if occupancy[source]:
+                piece = occupants[positions[source]]
+                if (
+                    isinstance(piece, Knight)
+                    and is_attacker(piece.color)
+                    and sum(1 for partial_index in partial_indices if occupancy[partial_index]) < 3
+                ):
+                    yield piece
+
+        # A pawn moving in direction d captures onto position from the squares
+        # a pawn moving in -d would capture onto.
+        for capture_axis in range(self.dimension):
+            for direction in (1, -1):
+                for source in self.tables.pawn_captures(index, -direction, capture_axis):
+                    if occupancy[source]:
+                        piece = occupants[positions[source]]
+                        if (
+                            isinstance(piece, Pawn)
+                            and piece.capture_axis == capture_axis
+                            and piece.direction == direction
+                            and is_attacker(piece.color)
+                        ):
+                            yield piece
+
+    def attackers(self, position: IntegerVector, by_color: Color) -> tuple["Piece", ...]:
+        return tuple(self.iter_attackers(position, lambda color: color == by_color))
+
+    def is_square_attacked(self, position: IntegerVector, by_color: Color) -> bool:
+        for _ in self.iter_attackers(position, lambda color: color == by_color):
+            return True
+        return False
+
+    def kings(self, color: Color) -> tuple[IntegerVector, ...]:
+        return self.find(PieceData(color, King))
 
-        assert new_board.contains(move.initial_position)
+    def in_check(self, color: Color) -> bool:
+        if self.backend is Backend.bitboard:
+            return self.bitboards.in_check(color)
 
-        if not force:
-            new_board.next_turn()
+        in_check = any(
+            next(self.iter_attackers(king_position, lambda attacker_color: attacker_color != color), None) is not None
+            for king_position in self.kings(color)
+        )
 
-        if new_board.contains(move.final_position):
-            new_board.remove(move.final_position)
+        if self.backend is Backend.cross_check:
+            assert in_check == self.bitboards.in_check(color)
 
-        new_board.get(move.initial_position).move(move)
-        
-        return new_board
+        return in_check
 
-    def in_check(self, color: Color) -> bool:
-        from nChess.Piece.King import King
-        kings_positions = self.find(PieceData(color, King))
+    def pseudo_moves(self, piece: "Piece", captures: bool = True, quiets: bool = True) -> list["Move"]:
+        if self.backend is Backend.object:
+            return piece.all_moves(captures, quiets)
+        if self.backend is Backend.bitboard:
+            return self.bitboards.moves(piece, captures, quiets)
 
-        for piece in self.pieces:
+        moves = piece.all_moves(captures, quiets)
+        assert sorted(moves, key=repr) == sorted(self.bitboards.moves(piece, captures, quiets), key=repr), piece
+        return moves
+
+    def iter_pseudo_moves(self, piece: "Piece") -> Iterator["Move"]:
+        if self.backend is Backend.object:
+            return piece.iter_moves()
+        return iter(self.pseudo_moves(piece))
+
+    def is_legal(self, move: "Move", check_info: CheckInfo) -> bool:
+        """Whether a pseudo-legal move of check_info's color keeps its king out of check."""
+        piece = self.get(move.initial_position)
+        if check_info.check_mask is not None:
+            legal = self.bitboards.is_legal(
+                piece, self.flat_index(move.initial_position), self.flat_index(move.final_position), check_info
+            )
+            if legal is not None:
+                if self.backend is Backend.cross_check:
+                    assert legal != self.leaves_in_check(move), move
+                return legal
+        return not check_info.requires_verification(piece) or not self.leaves_in_check(move)
+
+    def check_info(self, color: Color) -> CheckInfo:
+        if self.backend is Backend.bitboard:
+            check_info = self.bitboards.check_info(color)
+            if check_info is not None:
+                return check_info
+
+        occupancy = self.occupancy
+        occupants = self.occupants
+        positions = self.tables.positions
+
+        checkers = []
+        pinned = set()
+        for king_position in self.kings(color):
+            checkers.extend(self.iter_attackers(king_position, lambda attacker_color: attacker_color != color))
+
+            index = self.flat_index(king_position)
+            for rays, slider in ((self.tables.cardinal_rays(index), Rook), (self.tables.diagonal_rays(index), Bishop)):
+                for ray in rays:
+                    shield = None
+                    for target in ray:
+                        if not occupancy[target]:
+                            continue
+                        piece = occupants[positions[target]]
+                        if shield is None and piece.color == color:
+                            shield = piece
+                            continue
+                        if shield is not None and piece.color != color and isinstance(piece, (slider, Queen)):
+                            pinned.add(shield)
+                        break
+
+            # Knights jump only over fewer than three pieces, so own pieces
+            # blocking a knight with exactly three blockers are pinned too.
+            for source, partial_indices in self.tables.knight_targets(index):
+                if not occupancy[source]:
+                    continue
+                piece = occupants[positions[source]]
+                if piece.color == color or not isinstance(piece, Knight):
+                    continue
+                blockers = [
+                    occupants[positions[partial_index]]
+                    for partial_index in partial_indices
+                    if occupancy[partial_index]
+                ]
+                if len(blockers) == 3:
+                    pinned.update(blocker for blocker in blockers if blocker.color == color)
+
+        if self.backend is Backend.cross_check:
+            check_info = self.bitboards.check_info(color)
+            if check_info is not None:
+                assert set(check_info.checkers) == set(checkers) and check_info.pinned == pinned
+                return check_info
+
+        return CheckInfo(color, tuple(checkers), frozenset(pinned))
+
+    def legal_moves(self, color: Color) -> tuple["Move", ...]:
+        check_info = self.check_info(color)
+        if self.backend is Backend.bitboard and check_info.check_mask is not None:
+            return tuple(self.bitboards.legal_moves(color, check_info))
+
+        moves = tuple(
+            move
+            for piece in tuple(self.pieces)
+            if piece.color == color
+            for move in piece.legal_moves(check_info)
+        )
+        if self.backend is Backend.cross_check and check_info.check_mask is not None:
+            assert sorted(moves, key=repr) == sorted(self.bitboards.legal_moves(color, check_info), key=repr)
+        return moves
+
+    def iter_legal_moves(self, color: Color) -> Iterator["Move"]:
+        """legal_moves, generated piece by piece and ray by ray; legality is
+        checked as each move is reached. The board must not be changed while the
+        iterator is in use."""
+        check_info = self.check_info(color)
+        if self.backend is Backend.bitboard and check_info.check_mask is not None:
+            yield from self.bitboards.legal_moves(color, check_info)
+            return
+
+        for piece in tuple(self.pieces):
             if piece.color == color:
-                continue
-            if any(any(king_position == move.final_position for move in piece.piece.moves(self, piece.position)) for king_position in kings_positions):
-                return True
+                yield from piece.iter_legal_moves(check_info)
 
-        return False
+    def has_legal_move(self, color: Color) -> bool:
+        return next(self.iter_legal_moves(color), None) is not None
+
+    def legal_moves_from(self, position: IntegerVector) -> tuple["Move", ...]:
+        """Legal moves of the piece on position, computed once per position of
+        the board: any move, add or remove changes hash_key and drops the cache."""
+        if self.move_cache_key != self.hash_key:
+            self.move_cache = {}
+            self.move_cache_key = self.hash_key
+
+        moves = self.move_cache.get(position)
+        if moves is None:
+            moves = self.move_cache[position] = self.get(position).legal_moves()
+        return moves
 
     def in_checkmate(self, color: Color) -> bool:
         if not self.in_check(color):
             return False
 
-        for piece in self.pieces:
-            if piece.color != color:
-                continue
-
-            for move in piece.moves(self):
-                new_board = self.assume_move(move)
-                if not new_board.in_check(color):
-                    return False
-
-        return True
+        return not self.has_legal_move(color)
 
     def in_stalemate(self, color: Color) -> bool:
         if self.in_check(color):
             return False
 
-        return all(len(piece.moves(self)) == 0 for piece in self.pieces if piece.color == color)
-
+        return not self.has_legal_move(color)
 
 from nChess.Piece import Piece, Move, PieceData
+from nChess.Piece.Bishop import Bishop
+from nChess.Piece.King import King
+from nChess.Piece.Knight import Knight
+from nChess.Piece.Pawn import Pawn
+from nChess.Piece.Queen import Queen
+from nChess.Piece.Rook import Rook
+from nChess.nBoard.Geometry import Geometry, geometry
+from nChess.nBoard.AttackTables import AttackTables
+from nChess.nBoard.Bitboards import Bitboards
+from nChess.nBoard.Zobrist import ZobristKeys
+from nChess.nBoard import Encoding
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from nChess.bench import position
+from nChess.nBoard import Backend
+from nChess.Piece.Pawn import Pawn
+
+
+@pytest.mark.parametrize("name", ["classic", "tesseract", "hypercube:3:4"])
+def test_backends_agree_over_random_games(name):
+    rng = random.Random(name)
+    for _ in range(3):
+        boards = [position(name, backend) for backend in Backend]
+        for _ in range(60):
+            color = boards[0].current_turn()
+            legal = [sorted(board.legal_moves(color), key=repr) for board in boards]
+            assert legal[1:] == legal[:-1]
+
+            for other in boards[0].turn_order:
+                assert len({board.in_check(other) for board in boards}) == 1
+
+            # Each board has its own pieces: compare their squares.
+            infos = [board.check_info(color) for board in boards]
+            assert len({frozenset(piece.position for piece in info.checkers) for info in infos}) == 1
+            assert len({frozenset(piece.position for piece in info.pinned) for info in infos}) == 1
+
+            if not legal[0]:
+                break
+            move = rng.choice(legal[0])
+            for board in boards:
+                board.make_move(move)
+
+
+def test_capture_axis_is_part_of_the_position():
+    board = position("tesseract")
+    pawn = next(piece for piece in board.pieces if isinstance(piece, Pawn) and piece.capture_axis == 0)
+    square = pawn.position
+    moves = board.legal_moves_from(square)
+    keys = board.hash_key, board.pawn_key
+
+    board.remove(square)
+    board.add(Pawn, square, pawn.color, capture_axis=1)
+    assert (board.hash_key, board.pawn_key) != keys
+    assert board.legal_moves_from(square) == tuple(board.get(square).legal_moves()) != moves
+
+    board.remove(square)
+    board.add(Pawn, square, pawn.color)
+    assert (board.hash_key, board.pawn_key) == keys
@@ -0,0 +1,26 @@
+import random
+
+import pytest
+
+from nChess.bench import position
+from nChess.Engine.Evaluation import evaluate_from_scratch
+
+np = pytest.importorskip("numpy")
+from nChess.Engine.Batch import evaluate_batch
+
+
+@pytest.mark.parametrize("name", ["classic", "tesseract", "hypercube:3:4"])
+def test_batch_matches_evaluate_from_scratch(name):
+    rng = random.Random(name)
+    board = position(name)
+    boards = [board.copy()]
+    for _ in range(40):
+        moves = board.legal_moves(board.current_turn())
+        if not moves:
+            break
+        board.make_move(rng.choice(moves))
+        boards.append(board.copy())
+
+    for color in board.turn_order:
+        expected = [evaluate_from_scratch(board, color) for board in boards]
+        assert evaluate_batch(boards, color) == pytest.approx(expected)
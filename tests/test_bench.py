@@ -0,0 +1,12 @@
+import pytest
+
+from nChess.bench import position, divide, parallel_divide
+
+
+@pytest.mark.parametrize("split_depth, chunk_size", [(1, 1), (2, 7)])
+@pytest.mark.parametrize("name", ["classic", "hypercube:3:4"])
+def test_parallel_divide_matches_divide(name, split_depth, chunk_size):
+    board = position(name)
+    nodes, stats = parallel_divide(board, 2, workers=2, split_depth=split_depth, chunk_size=chunk_size)
+    assert nodes == divide(position(name), 2)
+    assert stats
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from nChess.bench import position
+from nChess.nBoard import Backend
+from nChess.Piece.Pawn import Pawn
+from nChess.Piece.Queen import Queen
+
+
+def promotes(board, move) -> bool:
+    piece = board.get(move.initial_position)
+    return isinstance(piece, Pawn) and move.final_position[1] == (board.size[1] - 1 if piece.direction > 0 else 0)
+
+
+def pick(board, rng):
+    """A random legal move, promotions first, or None."""
+    moves = board.legal_moves(board.current_turn())
+    promotions = [move for move in moves if promotes(board, move)]
+    return rng.choice(promotions or moves) if moves else None
+
+
+def state(board) -> tuple:
+    """Everything a move changes and its undo must restore."""
+    bitboards = board.bitboards
+    if bitboards is not None:
+        bitboards = bitboards.occupied, {
+            key: bitboards.boards[slot]
+            for slots in (bitboards.colors, bitboards.pieces, bitboards.pawns)
+            for key, slot in slots.items()
+            if bitboards.boards[slot]
+        }
+    return (
+        bitboards,
+        tuple(board.occupancy),
+        board.hash_key,
+        board.pawn_key,
+        board.turn_number,
+        # Undoing a promotion appends the pawn back, so the order of pieces may change.
+        sorted((id(piece), type(piece).__name__, piece.color.name, piece.position, piece.has_moved) for piece in board.pieces),
+        {position: id(piece) for position, piece in board.occupants.items()},
+    )
+
+
+@pytest.mark.parametrize("backend", [Backend.object, Backend.bitboard])
+@pytest.mark.parametrize("name", ["classic", "tesseract", "hypercube:3:4"])
+def test_make_unmake_round_trip(name, backend):
+    rng = random.Random(name)
+    board = position(name, backend)
+    captures = promotions = 0
+
+    for _ in range(100):
+        before = state(board)
+        records = []
+        # A few plies deep, then back to where we started.
+        for _ in range(rng.randint(1, 4)):
+            move = pick(board, rng)
+            if move is None:
+                break
+            captures += board.contains(move.final_position)
+            promoted = promotes(board, move)
+            records.append(board.make_move(move))
+            if promoted:
+                color = board.get(move.final_position).color
+                board.remove(move.final_position)
+                board.add(Queen, move.final_position, color, True)
+                promotions += 1
+        for record in reversed(records):
+            board.unmake_move(record)
+        assert state(board) == before
+
+        move = pick(board, rng)
+        if move is None:
+            break
+        board.make_move(move)
+    assert captures and promotions
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from nChess.bench import position
+from nChess.nBoard import nBoard
+from nChess.nBoard.Board import ClassicColor
+from nChess.Piece.King import King
+from nChess.Piece.Rook import Rook
+
+
+def played(name: str, plies: int, seed: int) -> nBoard:
+    board = position(name)
+    rng = random.Random(seed)
+    for _ in range(plies):
+        moves = board.legal_moves(board.current_turn())
+        if not moves:
+            break
+        board.make_move(rng.choice(moves))
+    return board
+
+
+@pytest.mark.parametrize("name", ["classic", "tesseract", "hypercube:3:5"])
+def test_bytes_round_trip(name):
+    board = played(name, 20, 1)
+    data = board.to_bytes()
+    decoded = nBoard.from_bytes(data)
+    assert decoded.to_bytes() == data
+    assert decoded.hash_key == board.hash_key
+    assert decoded.pawn_key == board.pawn_key
+    assert decoded.turn_number == board.turn_number
+
+
+@pytest.mark.parametrize("name", ["classic", "tesseract", "hypercube:3:5"])
+def test_tracked_codes_match_encoding_from_scratch(name):
+    board = position(name)
+    untracked = position(name)
+    rng = random.Random(name)
+    board.track_codes()
+    for _ in range(30):
+        assert board.to_bytes() == untracked.to_bytes()
+        moves = board.legal_moves(board.current_turn())
+        if not moves:
+            break
+        move = rng.choice(moves)
+        board.make_move(move)
+        untracked.make_move(move)
+    assert len(board.listeners) == 1 and not untracked.listeners
+
+
+@pytest.mark.parametrize("name", ["classic", "tesseract", "hypercube:3:5"])
+def test_nfen_round_trip(name):
+    board = played(name, 20, 2)
+    text = board.to_nfen()
+    decoded = nBoard.from_nfen(text)
+    assert decoded.to_nfen() == text
+    assert decoded.hash_key == board.hash_key
+
+
+def test_classic_start_nfen():
+    assert position("classic").to_nfen() == "RP4pr/NP4pn/BP4pb/KP4pk/QP4pq/BP4pb/NP4pn/RP4pr 8x8 0 white,black"
+
+
+def test_board_without_turn_order():
+    board = nBoard(4, (4, 4, 4, 4))
+    board.add(King, (3, 3, 3, 3), ClassicColor.white)
+    board.track_codes()
+
+    # Black sorts before white, so it takes the first code of the color table.
+    board.add(King, (0, 0, 0, 0), ClassicColor.black)
+    board.add(Rook, (1, 2, 3, 0), ClassicColor.white)
+
+    for decoded in (nBoard.from_bytes(board.to_bytes()), nBoard.from_nfen(board.to_nfen())):
+        assert decoded.turn_order == ()
+        assert decoded.hash_key == board.hash_key
+        assert decoded.get((0, 0, 0, 0)).color is ClassicColor.black
+        assert decoded.get((3, 3, 3, 3)).color is ClassicColor.white
+        assert decoded.get((1, 2, 3, 0)).color is ClassicColor.white
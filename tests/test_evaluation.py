@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from nChess.bench import position
+from nChess.Engine.Evaluation import Evaluation, evaluate_from_scratch
+from nChess.Piece.King import King
+from nChess.Piece.Knight import Knight
+from nChess.Piece.Pawn import Pawn
+from nChess.Piece.Queen import Queen
+
+
+def reaches_last_rank(board, piece, square) -> bool:
+    return isinstance(piece, Pawn) and square[1] == (board.size[1] - 1 if piece.direction > 0 else 0)
+
+
+def assert_matches(board, evaluation):
+    for color in board.turn_order:
+        assert evaluation.evaluate(color) == evaluate_from_scratch(board, color)
+
+
+@pytest.mark.parametrize("name", ["classic", "tesseract", "hypercube:3:4"])
+def test_incremental_evaluation_matches_from_scratch(name):
+    rng = random.Random(name)
+    board = position(name)
+    evaluation = Evaluation.of(board)
+    records = []
+    captures = promotions = 0
+
+    for _ in range(150):
+        color = board.current_turn()
+        moves = board.legal_moves(color)
+        roll = rng.random()
+        if records and (roll < 0.3 or not moves):
+            board.unmake_move(records.pop())
+        elif roll < 0.4:
+            # Pieces added or removed outside of a move cannot be unmade.
+            records.clear()
+            empty = [square for square in board.tables.positions if not board.contains(square)]
+            others = [piece for piece in board.pieces if not isinstance(piece, King)]
+            if others and rng.random() < 0.5:
+                board.remove(rng.choice(others).position)
+            else:
+                board.add(rng.choice((Pawn, Pawn, Knight, Queen)), rng.choice(empty), rng.choice(board.turn_order))
+        elif moves:
+            promoting = [move for move in moves if reaches_last_rank(board, board.get(move.initial_position), move.final_position)]
+            move = rng.choice(promoting if promoting and rng.random() < 0.5 else moves)
+            captures += board.contains(move.final_position)
+            records.append(board.make_move(move))
+            piece = board.get(move.final_position)
+            if reaches_last_rank(board, piece, piece.position):
+                board.remove(move.final_position)
+                board.add(Queen, move.final_position, piece.color, True)
+                promotions += 1
+        assert_matches(board, evaluation)
+
+    while records:
+        board.unmake_move(records.pop())
+        assert_matches(board, evaluation)
+    assert captures and promotions
@@ -0,0 +1,60 @@
+import random
+
+from nChess.bench import position
+from nChess.Database.GameStore import GameStore, SNAPSHOT_INTERVAL
+from nChess.nBoard import nBoard
+
+
+def random_game(name: str, plies: int, seed: int):
+    board = position(name)
+    start = nBoard.from_bytes(board.to_bytes())
+    rng = random.Random(seed)
+    moves = []
+    boards = [board.to_bytes()]
+    for _ in range(plies):
+        legal = board.legal_moves(board.current_turn())
+        if not legal:
+            break
+        moves.append(rng.choice(legal))
+        board.make_move(moves[-1])
+        boards.append(board.to_bytes())
+    return start, moves, boards
+
+
+def test_position_replays_every_ply(tmp_path):
+    start, moves, boards = random_game("classic", 2 * SNAPSHOT_INTERVAL + 5, 3)
+    with GameStore(str(tmp_path / "games")) as store:
+        game = store.add(start, moves)
+        assert list(store.moves(game)) == moves
+        for ply, encoded in enumerate(boards):
+            assert store.position(game, ply).to_bytes() == encoded
+        assert [board.to_bytes() for board in store.positions(game)] == boards
+
+
+def test_games_reaching(tmp_path):
+    start, moves, boards = random_game("tesseract", 12, 4)
+    with GameStore(str(tmp_path / "games")) as store:
+        game = store.add(start, moves)
+        other = store.add(*random_game("tesseract", 12, 5)[:2])
+        assert list(store.games_reaching(nBoard.from_bytes(boards[7]))) == [game]
+
+        # The turn number is not part of the position.
+        board = nBoard.from_bytes(boards[0])
+        board.set_turn_number(2)
+        assert set(store.games_reaching(board)) == {game, other}
+
+
+def test_index_survives_reopening(tmp_path):
+    path = str(tmp_path / "games")
+    games = [random_game("classic", 10, seed) for seed in range(6)]
+    with GameStore(path) as store:
+        store.index.journal_limit = 16
+        ids = store.add_games((start, moves) for start, moves, _ in games)
+
+    with GameStore(path) as store:
+        for game, (_, _, boards) in zip(ids, games):
+            assert game in set(store.games_reaching(nBoard.from_bytes(boards[-1])))
+        store.compact()
+        assert store.index.levels() == []
+        for game, (_, _, boards) in zip(ids, games):
+            assert game in set(store.games_reaching(nBoard.from_bytes(boards[-1])))
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from nChess.bench import position
+from nChess.Engine.Engine import Engine
+from nChess.Engine.TranspositionTable import TranspositionTable, Bound
+
+
+def boards(table: TranspositionTable, count: int) -> list[SimpleNamespace]:
+    """Stand-ins for boards whose keys all fall into bucket 1."""
+    return [SimpleNamespace(hash_key=1 + i * table.buckets) for i in range(count)]
+
+
+def test_deeper_entry_keeps_its_slot():
+    table = TranspositionTable(0.01)
+    deep, shallow, latest = boards(table, 3)
+
+    table.store(deep, 5, Bound.exact, 1.0, None)
+    table.store(shallow, 2, Bound.lower, 2.0, None)
+    assert table.probe(deep) == (5, Bound.exact, 1.0, None)
+    assert table.probe(shallow) == (2, Bound.lower, 2.0, None)
+
+    # The always-replace slot takes the latest shallower entry.
+    table.store(latest, 1, Bound.upper, 3.0, None)
+    assert table.probe(deep) == (5, Bound.exact, 1.0, None)
+    assert table.probe(shallow) is None
+    assert table.probe(latest) == (1, Bound.upper, 3.0, None)
+
+
+def test_deeper_search_takes_the_depth_preferred_slot():
+    table = TranspositionTable(0.01)
+    first, second = boards(table, 2)
+
+    table.store(first, 3, Bound.exact, 1.0, None)
+    table.store(second, 4, Bound.exact, 2.0, None)
+    assert table.probe(second) == (4, Bound.exact, 2.0, None)
+
+    # The displaced entry moves down to the always-replace slot.
+    assert table.probe(first) == (3, Bound.exact, 1.0, None)
+
+
+def test_same_position_is_stored_once():
+    table = TranspositionTable(0.01)
+    deep, shallow = boards(table, 2)
+
+    table.store(deep, 6, Bound.exact, 1.0, None)
+    table.store(shallow, 2, Bound.exact, 2.0, None)
+    table.store(shallow, 7, Bound.lower, 3.0, None)
+    assert len(table) == 2
+    assert table.probe(shallow) == (7, Bound.lower, 3.0, None)
+    assert table.probe(deep) == (6, Bound.exact, 1.0, None)
+
+
+def test_table_saves_nodes_without_changing_the_result():
+    results = []
+    for transposition_table in (None, TranspositionTable(1)):
+        engine = Engine(transposition_table=transposition_table)
+        results.append((engine.search(position("hypercube:3:4"), 3), engine.nodes))
+
+    (plain, plain_nodes), (cached, cached_nodes) = results
+    assert cached[:2] == plain[:2]
+    assert cached_nodes < plain_nodes